@@ -1,15 +1,22 @@
 from __future__ import annotations
 
+import queue
+import threading
 from contextlib import contextmanager
 from pathlib import Path
-from typing import Iterator
+from typing import Callable, Iterator
 
 import duckdb
 
+from .settings import load_settings
 
-def _init_schema(conn: duckdb.DuckDBPyConnection) -> None:
-    conn.execute("create schema if not exists dw_meta;")
-    conn.execute(
+
+DEFAULT_POOL_SIZE = 4
+
+
+_SCHEMA_SQL = ";\n".join(
+    [
+        "create schema if not exists dw_meta",
         """
         create table if not exists dw_meta.files (
           id varchar primary key,
@@ -18,11 +25,13 @@ def _init_schema(conn: duckdb.DuckDBPyConnection) -> None:
           size bigint not null,
           stored_path varchar not null,
           created_at timestamptz not null,
-          updated_at timestamptz not null
-        );
-        """
-    )
-    conn.execute(
+          updated_at timestamptz not null,
+          is_shared boolean default false
+        )
+        """,
+        # Shared rows point at files outside the project directory (the shipped seeds);
+        # they must never be modified or removed through the project.
+        "alter table dw_meta.files add column if not exists is_shared boolean default false",
         """
         create table if not exists dw_meta.tables (
           id varchar primary key,
@@ -32,10 +41,8 @@ def _init_schema(conn: duckdb.DuckDBPyConnection) -> None:
           dirty boolean not null,
           created_at timestamptz not null,
           updated_at timestamptz not null
-        );
-        """
-    )
-    conn.execute(
+        )
+        """,
         """
         create table if not exists dw_meta.table_versions (
           id varchar primary key,
@@ -45,55 +52,45 @@ def _init_schema(conn: duckdb.DuckDBPyConnection) -> None:
           op_log_id varchar,
           created_at timestamptz not null,
           is_active boolean not null
-        );
-        """
-    )
-    conn.execute(
+        )
+        """,
         """
         create table if not exists dw_meta.primary_keys (
           table_id varchar primary key,
           fields_json varchar not null,
           created_at timestamptz not null
-        );
-        """
-    )
-    conn.execute(
+        )
+        """,
         """
         create table if not exists dw_meta.primary_keys_inferred (
           table_id varchar primary key,
           fields_json varchar not null,
           created_at timestamptz not null
-        );
-        """
-    )
-    conn.execute(
+        )
+        """,
         """
         create table if not exists dw_meta.relation_edges (
           id varchar primary key,
           fk_table_id varchar not null,
-          fk_fields_json varchar not null,
+          fk_fields_json varchar[] not null,
           pk_table_id varchar not null,
-          pk_fields_json varchar not null,
+          pk_fields_json varchar[] not null,
           cardinality varchar not null,
           created_at timestamptz not null
-        );
-        """
-    )
-    conn.execute(
+        )
+        """,
         """
         create table if not exists dw_meta.relation_edges_inferred (
           id varchar primary key,
           fk_table_id varchar not null,
-          fk_fields_json varchar not null,
+          fk_fields_json varchar[] not null,
           pk_table_id varchar not null,
-          pk_fields_json varchar not null,
+          pk_fields_json varchar[] not null,
           cardinality varchar not null,
           coverage double not null,
           created_at timestamptz not null
-        );
-        """
-    )
-    conn.execute(
+        )
+        """,
         """
         create table if not exists dw_meta.column_profiles (
           table_id varchar not null,
@@ -106,21 +103,17 @@ def _init_schema(conn: duckdb.DuckDBPyConnection) -> None:
           inferred_nullable boolean not null,
           updated_at timestamptz not null,
           primary key (table_id, column_name)
-        );
-        """
-    )
-    conn.execute(
+        )
+        """,
         """
         create table if not exists dw_meta.lineage_edges (
           id varchar primary key,
           derived_table_id varchar not null,
-          source_table_ids_json varchar not null,
+          source_table_ids_json varchar[] not null,
           operation varchar not null,
           created_at timestamptz not null
-        );
-        """
-    )
-    conn.execute(
+        )
+        """,
         """
         create table if not exists dw_meta.operation_logs (
           id varchar primary key,
@@ -133,16 +126,195 @@ def _init_schema(conn: duckdb.DuckDBPyConnection) -> None:
           undoable boolean not null,
           prev_version_id varchar,
           new_version_id varchar
-        );
-        """
-    )
+        )
+        """,
+    ]
+)
+
+
+# Field/id lists were first stored as JSON text; they are now native VARCHAR[] (the column
+# names keep their _json suffix). Warehouses created before that are converted in place.
+_LIST_COLUMNS = (
+    ("relation_edges", "fk_fields_json"),
+    ("relation_edges", "pk_fields_json"),
+    ("relation_edges_inferred", "fk_fields_json"),
+    ("relation_edges_inferred", "pk_fields_json"),
+    ("lineage_edges", "source_table_ids_json"),
+)
+_migrate_lock = threading.Lock()
+
+
+def _migrate_list_columns(conn: duckdb.DuckDBPyConnection) -> None:
+    with _migrate_lock:
+        text_columns = set(
+            conn.execute(
+                """
+                select table_name, column_name
+                from duckdb_columns()
+                where schema_name = 'dw_meta' and data_type = 'VARCHAR'
+                """
+            ).fetchall()
+        )
+        for table, column in _LIST_COLUMNS:
+            if (table, column) in text_columns:
+                conn.execute(
+                    f"alter table dw_meta.{table} alter column {column} "
+                    f"set data type varchar[] using json_extract_string({column}, '$[*]')"
+                )
+
+
+def _init_schema(conn: duckdb.DuckDBPyConnection) -> None:
+    # One multi-statement script: a single parser/planner round trip.
+    conn.execute(_SCHEMA_SQL)
+    _migrate_list_columns(conn)
+
+
+def _duckdb_config() -> dict[str, str | int]:
+    # Explicit sizing keeps DuckDB from claiming every core / 80% of RAM inside a shared container.
+    settings = load_settings()
+    config: dict[str, str | int] = {}
+    if settings.duckdb_threads:
+        config["threads"] = settings.duckdb_threads
+    if settings.duckdb_memory_limit:
+        config["memory_limit"] = settings.duckdb_memory_limit
+    return config
+
+
+class ConnectionPool:
+    """Bounded set of keepalive connections to one project warehouse.
+
+    Connections are opened lazily (schema is initialized once per connection)
+    and handed out to a single caller at a time; DuckDB connections must not
+    be shared across concurrent requests.
+    """
+
+    def __init__(self, db_path: Path, size: int = DEFAULT_POOL_SIZE) -> None:
+        self.db_path = db_path
+        self.size = size
+        self._idle: queue.Queue[duckdb.DuckDBPyConnection] = queue.Queue(maxsize=size)
+        self._lock = threading.Lock()
+        self._created = 0
+        self._in_use: set[int] = set()
+        self._closed = False
+
+    def acquire(self) -> duckdb.DuckDBPyConnection:
+        try:
+            conn = self._idle.get_nowait()
+        except queue.Empty:
+            conn = None
+        if conn is None:
+            with self._lock:
+                if self._closed:
+                    raise RuntimeError(f"Connection pool closed: {self.db_path}")
+                create = self._created < self.size
+                if create:
+                    self._created += 1
+            if create:
+                try:
+                    conn = duckdb.connect(str(self.db_path), config=_duckdb_config())
+                    _init_schema(conn)
+                except BaseException:
+                    with self._lock:
+                        self._created -= 1
+                    raise
+            else:
+                conn = self._idle.get()
+        with self._lock:
+            self._in_use.add(id(conn))
+        return conn
+
+    def release(self, conn: duckdb.DuckDBPyConnection) -> None:
+        with self._lock:
+            if id(conn) not in self._in_use:
+                raise RuntimeError("Connection released twice or not owned by this pool")
+            self._in_use.discard(id(conn))
+            closed = self._closed
+            if closed:
+                self._created -= 1
+        if closed:
+            conn.close()
+        else:
+            self._idle.put_nowait(conn)
+
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            conn.close()
+            with self._lock:
+                self._created -= 1
+
+
+_pools: dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def _pool_for(db_path: Path) -> ConnectionPool:
+    key = str(db_path)
+    with _pools_lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = ConnectionPool(db_path)
+            _pools[key] = pool
+        return pool
+
+
+def close_pool(db_path: Path) -> None:
+    with _pools_lock:
+        pool = _pools.pop(str(db_path), None)
+    if pool is not None:
+        pool.close()
+
+
+def shutdown() -> None:
+    with _pools_lock:
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.close()
 
 
 @contextmanager
 def connect(db_path: Path) -> Iterator[duckdb.DuckDBPyConnection]:
-    conn = duckdb.connect(str(db_path))
+    pool = _pool_for(db_path)
+    conn = pool.acquire()
     try:
-        _init_schema(conn)
         yield conn
     finally:
-        conn.close()
+        pool.release(conn)
+
+
+# id(conn) -> callbacks waiting for the transaction() open on that connection to commit.
+_after_commit: dict[int, list[Callable[[], None]]] = {}
+
+
+def after_commit(conn: duckdb.DuckDBPyConnection, callback: Callable[[], None]) -> None:
+    # Outside transaction() every statement has already committed, so run it right away.
+    pending = _after_commit.get(id(conn))
+    if pending is None:
+        callback()
+    else:
+        pending.append(callback)
+
+
+@contextmanager
+def transaction(conn: duckdb.DuckDBPyConnection) -> Iterator[duckdb.DuckDBPyConnection]:
+    # Group several statements into one commit (one WAL flush); roll back on any error.
+    conn.begin()
+    _after_commit[id(conn)] = []
+    try:
+        try:
+            yield conn
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+        callbacks = _after_commit.pop(id(conn))
+    finally:
+        _after_commit.pop(id(conn), None)
+    for callback in callbacks:
+        callback()
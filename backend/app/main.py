@@ -2,12 +2,14 @@ from __future__ import annotations
 
 import os
 import traceback
-from uuid import uuid4
 
-from fastapi import FastAPI, Request
+import orjson
+from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse, Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
+from .db import shutdown as shutdown_pools
 from .settings import load_settings
 from .routers.projects import router as projects_router
 
@@ -15,9 +17,59 @@ from .routers.projects import router as projects_router
 settings = load_settings()
 settings.data_dir.mkdir(parents=True, exist_ok=True)
 
-app = FastAPI(title="Data Weaver API", version="0.1.0")
+app = FastAPI(title="Data Weaver API", version="0.1.0", default_response_class=ORJSONResponse)
 debug = os.getenv("DATA_WEAVER_DEBUG", "").lower() in {"1", "true", "yes", "on"}
 
+_ERROR_BODY_PREFIX = b'{"detail":"Internal Server Error","errorId":"'
+
+
+class ErrorTaggingMiddleware:
+    # Pure ASGI: no Request/Response objects are built on the success path.
+    def __init__(self, app: ASGIApp, debug: bool = False) -> None:
+        self.app = app
+        self.debug = debug
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        response_started = False
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal response_started
+            if message["type"] == "http.response.start":
+                response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception as exc:
+            error_id = os.urandom(5).hex()
+            print(f"[data-weaver] errorId={error_id} path={scope['path']}")
+            traceback.print_exc()
+            if response_started:
+                raise
+            if self.debug:
+                payload = {"detail": "Internal Server Error", "errorId": error_id, "exception": repr(exc)}
+                body = orjson.dumps(payload)
+            else:
+                body = _ERROR_BODY_PREFIX + error_id.encode("ascii") + b'"}'
+            await send(
+                {
+                    "type": "http.response.start",
+                    "status": 500,
+                    "headers": [
+                        (b"content-type", b"application/json"),
+                        (b"content-length", str(len(body)).encode("ascii")),
+                        (b"x-error-id", error_id.encode("ascii")),
+                    ],
+                }
+            )
+            await send({"type": "http.response.body", "body": body})
+
+
+app.add_middleware(ErrorTaggingMiddleware, debug=debug)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=settings.allowed_origins,
@@ -29,17 +81,15 @@ app.add_middleware(
 app.include_router(projects_router, prefix="/api")
 
 
-@app.exception_handler(Exception)
-async def unhandled_exception_handler(request: Request, exc: Exception) -> JSONResponse:
-    error_id = uuid4().hex[:10]
-    print(f"[data-weaver] errorId={error_id} path={request.url.path}")
-    traceback.print_exc()
-    payload: dict[str, str] = {"detail": "Internal Server Error", "errorId": error_id}
-    if debug:
-        payload["exception"] = repr(exc)
-    return JSONResponse(status_code=500, content=payload)
+@app.on_event("shutdown")
+def close_connection_pools() -> None:
+    shutdown_pools()
+
+
+_HEALTH_BODY = b'{"status":"ok"}'
 
 
 @app.get("/api/health")
-def health() -> dict[str, str]:
-    return {"status": "ok"}
+def health() -> Response:
+    # Probed often by load balancers; the body is encoded once at import.
+    return Response(content=_HEALTH_BODY, media_type="application/json")
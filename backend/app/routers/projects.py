@@ -1,13 +1,21 @@
 from __future__ import annotations
 
-import json
 import shutil
+import threading
+import time
+import traceback
+from contextlib import ExitStack
 from pathlib import Path
+from typing import Iterator
 
-from fastapi import APIRouter, File, HTTPException, UploadFile
-from fastapi.responses import FileResponse
+import duckdb
+import orjson
+from fastapi import APIRouter, BackgroundTasks, File, HTTPException, UploadFile
+from fastapi.concurrency import run_in_threadpool
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import FileResponse, Response, StreamingResponse
 
-from ..db import connect
+from ..db import close_pool, connect, transaction
 from ..schemas import (
   ChartIn,
   ChartOut,
@@ -20,6 +28,7 @@ from ..schemas import (
   DataTableOut,
   ExportIn,
   ExportOut,
+  FILTERS_ADAPTER,
   LineageEdgeOut,
   MergeIn,
   MergeReportOut,
@@ -33,18 +42,22 @@ from ..schemas import (
   ReshapeIn,
   ReshapeReportOut,
   RowsQueryIn,
+  SORT_ADAPTER,
   RowsQueryOut,
   SetPrimaryKeyIn,
   SummaryResultOut,
 )
 from ..settings import load_settings
-from ..seed import ensure_demo_project
+from ..seed import ensure_demo_project, wait_for_seed_inference
 from ..storage import (
+  create_project_dirs,
   list_project_manifests,
   project_db_path,
+  project_dir,
   project_exports_dir,
   project_files_dir,
   project_manifest_path,
+  read_project_manifest,
   write_project_manifest,
 )
 from ..utils import ensure_dir, new_id, utcnow
@@ -57,6 +70,7 @@ from ..services import (
   create_relation,
   export_table_csv,
   export_table_dta,
+  export_table_parquet,
   get_history,
   get_table_meta,
   import_csv,
@@ -65,9 +79,11 @@ from ..services import (
   list_lineages,
   list_relations,
   list_tables,
-  query_rows,
+  ROWS_BATCH_SIZE,
+  query_row_batches,
   relation_report,
   refresh_column_profiles,
+  refresh_inferred_primary_key,
   refresh_inferred_relations,
   reshape_table,
   set_primary_key,
@@ -80,19 +96,81 @@ from ..services import (
 router = APIRouter()
 settings = load_settings()
 
+# Sibling cursors used to profile a freshly imported table's columns concurrently.
+PROFILE_WORKERS = 4
+
+# project_id -> monotonic time of the last successful existence check.
+_PROJECT_CHECK_TTL_SECONDS = 30.0
+_checked_projects: dict[str, float] = {}
+
 
 def _ensure_project_exists(project_id: str) -> Path:
+  db_path = project_db_path(settings, project_id)
+  checked_at = _checked_projects.get(project_id)
+  if checked_at is not None and time.monotonic() - checked_at < _PROJECT_CHECK_TTL_SECONDS:
+    return db_path
   manifest = project_manifest_path(settings, project_id)
   if not manifest.exists():
     raise HTTPException(status_code=404, detail="Project not found")
   ensure_dir(project_files_dir(settings, project_id))
   ensure_dir(project_exports_dir(settings, project_id))
-  return project_db_path(settings, project_id)
+  _checked_projects[project_id] = time.monotonic()
+  return db_path
+
+
+def _ensure_project_ready(project_id: str) -> Path:
+  # For sync routes that read or rewrite inferred profiles/keys/relations: a freshly seeded
+  # project computes them after its seed commits. Async routes wait via run_in_threadpool.
+  db_path = _ensure_project_exists(project_id)
+  wait_for_seed_inference(db_path)
+  return db_path
+
+
+# Single-flight relation refresh per project: a request that arrives while a refresh is
+# running only marks it pending, and the running worker does one more pass at the end.
+_refresh_running: set[str] = set()
+_refresh_pending: set[str] = set()
+_refresh_guard = threading.Lock()
+
+
+def _refresh_relations_task(db_path: Path) -> None:
+  # Cross-table relation inference is O(tables^2); it runs after the response is sent.
+  key = str(db_path)
+  wait_for_seed_inference(db_path)
+  with _refresh_guard:
+    if key in _refresh_running:
+      _refresh_pending.add(key)
+      return
+    _refresh_running.add(key)
+  try:
+    while True:
+      with _refresh_guard:
+        _refresh_pending.discard(key)
+      if not db_path.exists():
+        return
+      with connect(db_path) as conn:
+        refresh_inferred_relations(conn)
+      with _refresh_guard:
+        if key not in _refresh_pending:
+          return
+  except Exception:
+    print(f"[data-weaver] background relation refresh failed db={db_path}")
+    traceback.print_exc()
+  finally:
+    with _refresh_guard:
+      _refresh_running.discard(key)
+      _refresh_pending.discard(key)
+
+
+_EMPTY_LIST_BODY = b"[]"
 
 
 @router.get("/projects", response_model=list[ProjectOut])
-def list_projects() -> list[dict]:
-  return list_project_manifests(settings)
+def list_projects() -> list[dict] | Response:
+  manifests = list_project_manifests(settings)
+  if not manifests:
+    return Response(content=_EMPTY_LIST_BODY, media_type="application/json")
+  return manifests
 
 
 @router.post("/projects", response_model=ProjectOut)
@@ -106,11 +184,9 @@ def create_project(body: ProjectCreate) -> dict:
     "updatedAt": now.isoformat(),
     "tags": body.tags,
   }
+  create_project_dirs(settings, project_id)
   write_project_manifest(settings, project_id, manifest)
-  ensure_dir(project_files_dir(settings, project_id))
-  ensure_dir(project_exports_dir(settings, project_id))
   db_path = project_db_path(settings, project_id)
-  ensure_dir(db_path.parent)
   with connect(db_path):
     pass
   return manifest
@@ -124,10 +200,10 @@ def seed_demo() -> dict:
 
 @router.get("/projects/{project_id}", response_model=ProjectOut)
 def get_project(project_id: str) -> dict:
-  manifest = project_manifest_path(settings, project_id)
-  if not manifest.exists():
+  manifest = read_project_manifest(settings, project_id)
+  if manifest is None:
     raise HTTPException(status_code=404, detail="Project not found")
-  return json.loads(manifest.read_text(encoding="utf-8"))
+  return manifest
 
 
 @router.delete("/projects/{project_id}")
@@ -135,13 +211,17 @@ def delete_project(project_id: str) -> dict:
   manifest = project_manifest_path(settings, project_id)
   if not manifest.exists():
     raise HTTPException(status_code=404, detail="Project not found")
-  from ..storage import project_dir
+  _checked_projects.pop(project_id, None)
+  wait_for_seed_inference(project_db_path(settings, project_id))
+  close_pool(project_db_path(settings, project_id))
   proj_dir = project_dir(settings, project_id)
   shutil.rmtree(proj_dir, ignore_errors=True)
   return {"ok": True}
 
 
-@router.get("/projects/{project_id}/files", response_model=list[DataFileOut])
+# Hot read paths: services already return the documented shapes, so the response model
+# is only used for OpenAPI docs and not re-validated per row.
+@router.get("/projects/{project_id}/files", response_model=None, responses={200: {"model": list[DataFileOut]}})
 def get_files(project_id: str) -> list[dict]:
   db_path = _ensure_project_exists(project_id)
   with connect(db_path) as conn:
@@ -151,50 +231,98 @@ def get_files(project_id: str) -> list[dict]:
   return files
 
 
-@router.post("/projects/{project_id}/files/import", response_model=dict)
-async def import_file(project_id: str, file: UploadFile = File(...)) -> dict:
-  db_path = _ensure_project_exists(project_id)
+_INSERT_FILE_SQL = """
+  insert into dw_meta.files (id, name, type, size, stored_path, created_at, updated_at)
+  values (?, ?, ?, ?, ?, ?, ?)
+"""
+
 
+def _upload_name_and_ext(file: UploadFile) -> tuple[str, str]:
   filename = Path(file.filename or "upload").name
   ext = filename.lower().split(".")[-1] if "." in filename else ""
   if ext not in {"csv", "xlsx", "xls"}:
     raise HTTPException(status_code=400, detail="Unsupported file type (csv/xlsx/xls)")
+  return filename, ext
 
+
+def _store_upload(project_id: str, file: UploadFile, filename: str) -> tuple[str, Path, int]:
   file_id = new_id("file")
   stored = project_files_dir(settings, project_id) / f"{file_id}_{filename}"
   ensure_dir(stored.parent)
-  content = await file.read()
-  stored.write_bytes(content)
+  # Stream to disk in 1 MiB chunks; memory stays bounded regardless of upload size.
+  with stored.open("wb") as out:
+    shutil.copyfileobj(file.file, out, 1024 * 1024)
+    size = out.tell()
+  return file_id, stored, size
+
 
+def _import_stored_file(conn: duckdb.DuckDBPyConnection, file_id: str, filename: str, ext: str, stored: Path) -> dict:
   table_id = new_id("table")
   table_name = Path(filename).stem
+  if ext == "csv":
+    import_csv(conn, file_id, table_id, table_name, stored)
+  else:
+    import_xlsx(conn, file_id, table_id, table_name, stored)
+
+  # Facts-based metadata (nullable/unique/identity + inferred PK) from actual data;
+  # inferred relations follow in the background. The table itself is committed above,
+  # so the profiling cursors can read it while the metadata writes share one transaction.
+  with transaction(conn):
+    refresh_column_profiles(conn, table_id, workers=PROFILE_WORKERS)
+    refresh_inferred_primary_key(conn, table_id)
+    return get_table_meta(conn, table_id)
+
+
+@router.post("/projects/{project_id}/files/import", response_model=dict)
+async def import_file(project_id: str, background_tasks: BackgroundTasks, file: UploadFile = File(...)) -> dict:
+  db_path = _ensure_project_exists(project_id)
+  await run_in_threadpool(wait_for_seed_inference, db_path)
+  filename, ext = _upload_name_and_ext(file)
+  file_id, stored, size = _store_upload(project_id, file, filename)
 
   with connect(db_path) as conn:
     now = utcnow()
-    conn.execute(
-      """
-      insert into dw_meta.files (id, name, type, size, stored_path, created_at, updated_at)
-      values (?, ?, ?, ?, ?, ?, ?)
-      """,
-      [file_id, filename, ext, len(content), str(stored), now, now],
-    )
-    if ext == "csv":
-      import_csv(conn, file_id, table_id, table_name, stored)
-    else:
-      import_xlsx(conn, file_id, table_id, table_name, stored)
+    conn.execute(_INSERT_FILE_SQL, [file_id, filename, ext, size, str(stored), now, now])
+    table = _import_stored_file(conn, file_id, filename, ext, stored)
 
-    # Facts-based metadata (nullable/unique/identity + inferred relations) from actual data.
-    refresh_column_profiles(conn, table_id)
-    refresh_inferred_relations(conn)
+  background_tasks.add_task(_refresh_relations_task, db_path)
+  return {"fileId": file_id, "table": table}
 
-    table = get_table_meta(conn, table_id)
 
-  return {"fileId": file_id, "table": table}
+@router.post("/projects/{project_id}/files/import:batch", response_model=dict)
+async def import_files_batch(
+  project_id: str,
+  background_tasks: BackgroundTasks,
+  files: list[UploadFile] = File(...),
+) -> dict:
+  db_path = _ensure_project_exists(project_id)
+  await run_in_threadpool(wait_for_seed_inference, db_path)
+  # Validate every upload before writing any of them.
+  names = [_upload_name_and_ext(f) for f in files]
+  stored_files = [_store_upload(project_id, f, filename) for f, (filename, _ext) in zip(files, names)]
+
+  with connect(db_path) as conn:
+    now = utcnow()
+    # One executemany for all file rows instead of one INSERT per upload.
+    conn.executemany(
+      _INSERT_FILE_SQL,
+      [
+        [file_id, filename, ext, size, str(stored), now, now]
+        for (filename, ext), (file_id, stored, size) in zip(names, stored_files)
+      ],
+    )
+    results = [
+      {"fileId": file_id, "table": _import_stored_file(conn, file_id, filename, ext, stored)}
+      for (filename, ext), (file_id, stored, _size) in zip(names, stored_files)
+    ]
+
+  background_tasks.add_task(_refresh_relations_task, db_path)
+  return {"files": results}
 
 
-@router.get("/projects/{project_id}/tables", response_model=list[DataTableOut])
+@router.get("/projects/{project_id}/tables", response_model=None, responses={200: {"model": list[DataTableOut]}})
 def get_tables(project_id: str) -> list[dict]:
-  db_path = _ensure_project_exists(project_id)
+  db_path = _ensure_project_ready(project_id)
   with connect(db_path) as conn:
     return list_tables(conn)
 
@@ -208,10 +336,9 @@ def get_lineages(project_id: str) -> list[dict]:
 
 @router.get("/projects/{project_id}/canvas")
 def get_canvas(project_id: str) -> dict:
-  db_path = _ensure_project_exists(project_id)
+  db_path = _ensure_project_ready(project_id)
   with connect(db_path) as conn:
-    # Keep canvas metadata fresh: infer relations from actual data values.
-    refresh_inferred_relations(conn)
+    # Inferred relations are kept current by the background refresh after each write.
     return {
       "tables": list_tables(conn),
       "relations": list_relations(conn),
@@ -221,7 +348,7 @@ def get_canvas(project_id: str) -> dict:
 
 @router.get("/projects/{project_id}/tables/{table_id}", response_model=DataTableOut)
 def get_table(project_id: str, table_id: str) -> dict:
-  db_path = _ensure_project_exists(project_id)
+  db_path = _ensure_project_ready(project_id)
   with connect(db_path) as conn:
     try:
       return get_table_meta(conn, table_id)
@@ -229,24 +356,65 @@ def get_table(project_id: str, table_id: str) -> dict:
       raise HTTPException(status_code=404, detail="Table not found")
 
 
-@router.post("/projects/{project_id}/tables/{table_id}/rows:query", response_model=RowsQueryOut)
-def rows_query(project_id: str, table_id: str, body: RowsQueryIn) -> dict:
+@router.post("/projects/{project_id}/tables/{table_id}/rows:query", response_model=None, responses={200: {"model": RowsQueryOut}})
+def rows_query(project_id: str, table_id: str, body: RowsQueryIn) -> dict | Response:
   db_path = _ensure_project_exists(project_id)
-  with connect(db_path) as conn:
+  with ExitStack() as stack:
+    conn = stack.enter_context(connect(db_path))
     try:
-      rows, total = query_rows(
+      batches, total = query_row_batches(
         conn,
         table_id,
         offset=body.offset,
         limit=body.limit,
-        filters=[f.model_dump() for f in body.filters],
-        sort=[s.model_dump() for s in body.sort],
+        filters=FILTERS_ADAPTER.dump_python(body.filters),
+        sort=SORT_ADAPTER.dump_python(body.sort),
       )
     except KeyError:
       raise HTTPException(status_code=404, detail="Table not found")
     except ValueError as e:
       raise HTTPException(status_code=400, detail=str(e))
-  return {"rows": rows, "totalRows": total}
+    if body.limit <= ROWS_BATCH_SIZE:
+      return {"rows": [row for rows in batches for row in rows], "totalRows": total}
+    # Large pages are encoded batch by batch while the connection stays checked out.
+    chunks = _rows_json_chunks(stack.pop_all(), batches, total)
+    first = next(chunks)
+    return StreamingResponse(_prepend(first, chunks), media_type="application/json")
+
+
+# orjson handles the common column types natively. Anything it can't (INTERVAL timedeltas,
+# BLOB bytes, ...) is encoded the way jsonable_encoder encodes small pages, so both paths
+# agree and a row can't fail after the response has started streaming.
+_ROWS_JSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+
+def _rows_json_default(obj: object) -> object:
+  if isinstance(obj, bytes):
+    # jsonable_encoder decodes bytes as UTF-8 too, but would raise on invalid input.
+    return obj.decode("utf-8", "replace")
+  return jsonable_encoder(obj)
+
+
+def _rows_json_chunks(stack: ExitStack, batches: Iterator[list[dict]], total: int) -> Iterator[bytes]:
+  # Same body as RowsQueryOut through ORJSONResponse: {"rows": [...], "totalRows": n}.
+  with stack:
+    yield b'{"rows":['
+    sep = b""
+    for rows in batches:
+      if rows:
+        yield sep + orjson.dumps(rows, default=_rows_json_default, option=_ROWS_JSON_OPTIONS)[1:-1]
+        sep = b","
+    yield b'],"totalRows":' + str(total).encode() + b"}"
+
+
+def _prepend(first: bytes, rest: Iterator[bytes]) -> Iterator[bytes]:
+  # The chunk generator is advanced once before the response is built so the connection is
+  # owned by a started generator, whose close() (or collection) releases it to the pool.
+  try:
+    yield first
+    yield from rest
+  finally:
+    rest.close()
 
 
 @router.post("/projects/{project_id}/tables/{table_id}/summary", response_model=SummaryResultOut)
@@ -284,22 +452,22 @@ def table_quality(project_id: str, table_id: str, body: QualityReportIn) -> dict
 
 
 @router.put("/projects/{project_id}/tables/{table_id}/pk")
-def set_pk(project_id: str, table_id: str, body: SetPrimaryKeyIn) -> dict:
-  db_path = _ensure_project_exists(project_id)
+def set_pk(project_id: str, table_id: str, body: SetPrimaryKeyIn, background_tasks: BackgroundTasks) -> dict:
+  db_path = _ensure_project_ready(project_id)
   with connect(db_path) as conn:
     try:
       set_primary_key(conn, table_id, body.fields)
-      refresh_inferred_relations(conn)
     except KeyError:
       raise HTTPException(status_code=404, detail="Table not found")
     except ValueError as e:
       raise HTTPException(status_code=400, detail=str(e))
+  background_tasks.add_task(_refresh_relations_task, db_path)
   return {"ok": True}
 
 
-@router.get("/projects/{project_id}/relations", response_model=list[RelationEdgeOut])
+@router.get("/projects/{project_id}/relations", response_model=None, responses={200: {"model": list[RelationEdgeOut]}})
 def relations_list(project_id: str) -> list[dict]:
-  db_path = _ensure_project_exists(project_id)
+  db_path = _ensure_project_ready(project_id)
   with connect(db_path) as conn:
     return list_relations(conn)
 
@@ -316,7 +484,7 @@ def relations_create(project_id: str, body: CreateRelationIn) -> dict:
 
 @router.get("/projects/{project_id}/relations/{relation_id}/report", response_model=RelationReportOut)
 def relations_report(project_id: str, relation_id: str) -> dict:
-  db_path = _ensure_project_exists(project_id)
+  db_path = _ensure_project_ready(project_id)
   with connect(db_path) as conn:
     try:
       return relation_report(conn, relation_id)
@@ -327,43 +495,45 @@ def relations_report(project_id: str, relation_id: str) -> dict:
 
 
 @router.post("/projects/{project_id}/merge", response_model=dict)
-def merge(project_id: str, body: MergeIn) -> dict:
-  db_path = _ensure_project_exists(project_id)
+def merge(project_id: str, body: MergeIn, background_tasks: BackgroundTasks) -> dict:
+  db_path = _ensure_project_ready(project_id)
   with connect(db_path) as conn:
     try:
+      # merge_tables profiles the new table while building its metadata.
       table, report, lineage = merge_tables(conn, body.model_dump())
-      refresh_column_profiles(conn, table["id"])
-      refresh_inferred_relations(conn)
     except KeyError:
       raise HTTPException(status_code=404, detail="Table not found")
     except ValueError as e:
       raise HTTPException(status_code=400, detail=str(e))
+  background_tasks.add_task(_refresh_relations_task, db_path)
   return {"table": table, "mergeReport": report, "lineageEdges": lineage}
 
 
 @router.post("/projects/{project_id}/reshape", response_model=dict)
-def reshape(project_id: str, body: ReshapeIn) -> dict:
-  db_path = _ensure_project_exists(project_id)
+def reshape(project_id: str, body: ReshapeIn, background_tasks: BackgroundTasks) -> dict:
+  db_path = _ensure_project_ready(project_id)
   with connect(db_path) as conn:
     try:
+      # reshape_table profiles the new table while building its metadata.
       table, report, lineage = reshape_table(conn, body.model_dump())
-      refresh_column_profiles(conn, table["id"])
-      refresh_inferred_relations(conn)
     except KeyError:
       raise HTTPException(status_code=404, detail="Table not found")
     except ValueError as e:
       raise HTTPException(status_code=400, detail=str(e))
+  background_tasks.add_task(_refresh_relations_task, db_path)
   return {"table": table, "reshapeReport": report, "lineageEdges": lineage}
 
 
 @router.post("/projects/{project_id}/tables/{table_id}/clean:drop-missing")
-def clean_drop_missing_route(project_id: str, table_id: str, body: SetPrimaryKeyIn) -> dict:
-  db_path = _ensure_project_exists(project_id)
+def clean_drop_missing_route(project_id: str, table_id: str, body: SetPrimaryKeyIn, background_tasks: BackgroundTasks) -> dict:
+  db_path = _ensure_project_ready(project_id)
   with connect(db_path) as conn:
     try:
       res = clean_drop_missing(conn, table_id, body.fields)
-      refresh_column_profiles(conn, table_id)
-      refresh_inferred_relations(conn)
+      # Profile delete + insert commit together, as after an import.
+      with transaction(conn):
+        refresh_column_profiles(conn, table_id)
+      background_tasks.add_task(_refresh_relations_task, db_path)
       return res
     except KeyError:
       raise HTTPException(status_code=404, detail="Table not found")
@@ -376,7 +546,7 @@ def clean_preview_route(project_id: str, table_id: str, body: CleanPreviewIn) ->
   db_path = _ensure_project_exists(project_id)
   with connect(db_path) as conn:
     try:
-      return preview_clean(conn, table_id, action=body.action, fields=body.fields, filters=[f.model_dump() for f in body.filters], limit=body.limit)
+      return preview_clean(conn, table_id, action=body.action, fields=body.fields, filters=FILTERS_ADAPTER.dump_python(body.filters), limit=body.limit)
     except KeyError:
       raise HTTPException(status_code=404, detail="Table not found")
     except ValueError as e:
@@ -384,13 +554,14 @@ def clean_preview_route(project_id: str, table_id: str, body: CleanPreviewIn) ->
 
 
 @router.post("/projects/{project_id}/tables/{table_id}/clean", response_model=CleanOut)
-def clean_route(project_id: str, table_id: str, body: CleanIn) -> dict:
-  db_path = _ensure_project_exists(project_id)
+def clean_route(project_id: str, table_id: str, body: CleanIn, background_tasks: BackgroundTasks) -> dict:
+  db_path = _ensure_project_ready(project_id)
   with connect(db_path) as conn:
     try:
-      res = clean_table(conn, table_id, action=body.action, fields=body.fields, filters=[f.model_dump() for f in body.filters])
-      refresh_column_profiles(conn, table_id)
-      refresh_inferred_relations(conn)
+      res = clean_table(conn, table_id, action=body.action, fields=body.fields, filters=FILTERS_ADAPTER.dump_python(body.filters))
+      with transaction(conn):
+        refresh_column_profiles(conn, table_id)
+      background_tasks.add_task(_refresh_relations_task, db_path)
       return res
     except KeyError:
       raise HTTPException(status_code=404, detail="Table not found")
@@ -398,7 +569,7 @@ def clean_route(project_id: str, table_id: str, body: CleanIn) -> dict:
       raise HTTPException(status_code=400, detail=str(e))
 
 
-@router.get("/projects/{project_id}/history", response_model=list[OperationLogOut])
+@router.get("/projects/{project_id}/history", response_model=None, responses={200: {"model": list[OperationLogOut]}})
 def history(project_id: str) -> list[dict]:
   db_path = _ensure_project_exists(project_id)
   with connect(db_path) as conn:
@@ -406,13 +577,14 @@ def history(project_id: str) -> list[dict]:
 
 
 @router.post("/projects/{project_id}/history/undo")
-def undo(project_id: str) -> dict:
-  db_path = _ensure_project_exists(project_id)
+def undo(project_id: str, background_tasks: BackgroundTasks) -> dict:
+  db_path = _ensure_project_ready(project_id)
   with connect(db_path) as conn:
     res = undo_last_clean(conn)
     if res and res.get("tableId"):
-      refresh_column_profiles(conn, res["tableId"])
-      refresh_inferred_relations(conn)
+      with transaction(conn):
+        refresh_column_profiles(conn, res["tableId"])
+      background_tasks.add_task(_refresh_relations_task, db_path)
   if not res:
     return {"ok": False, "message": "Nothing to undo"}
   return {"ok": True, **res}
@@ -431,6 +603,8 @@ def export(project_id: str, table_id: str, body: ExportIn) -> dict:
   with connect(db_path) as conn:
     if fmt == "csv":
       export_table_csv(conn, table_id, out_path)
+    elif fmt == "parquet":
+      export_table_parquet(conn, table_id, out_path)
     else:
       export_table_dta(conn, table_id, out_path)
 
@@ -442,10 +616,28 @@ def export(project_id: str, table_id: str, body: ExportIn) -> dict:
   }
 
 
+_EXPORT_MEDIA_TYPES = {
+  ".csv": "text/csv",
+  ".dta": "application/x-stata-dta",
+  ".parquet": "application/vnd.apache.parquet",
+}
+
+
 @router.get("/projects/{project_id}/exports/{filename}")
 def download_export(project_id: str, filename: str) -> FileResponse:
   _ensure_project_exists(project_id)
-  path = project_exports_dir(settings, project_id) / Path(filename).name
-  if not path.exists():
+  name = Path(filename).name
+  path = project_exports_dir(settings, project_id) / name
+  try:
+    # Passing the stat result lets Starlette skip its own stat before sendfile.
+    stat_result = path.stat()
+  except FileNotFoundError:
     raise HTTPException(status_code=404, detail="Not found")
-  return FileResponse(path)
+  return FileResponse(
+    path,
+    stat_result=stat_result,
+    media_type=_EXPORT_MEDIA_TYPES.get(path.suffix.lower()),
+    filename=name,
+    # Export filenames are timestamped, so a given file never changes.
+    headers={"Cache-Control": "private, max-age=60"},
+  )
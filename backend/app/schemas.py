@@ -3,7 +3,7 @@ from __future__ import annotations
 from datetime import datetime
 from typing import Any, Literal
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 
 
 FieldType = Literal[
@@ -22,6 +22,9 @@ FieldType = Literal[
   "jsonb",
 ]
 
+# Request bodies are read-only once parsed; unknown keys are dropped rather than stored.
+_REQUEST_CONFIG = ConfigDict(extra="ignore", frozen=True, defer_build=False)
+
 
 class ProjectOut(BaseModel):
   id: str
@@ -98,17 +101,28 @@ class OperationLogOut(BaseModel):
 
 
 class SortSpec(BaseModel):
+  model_config = _REQUEST_CONFIG
+
   field: str
   direction: Literal["asc", "desc"] = "asc"
 
 
 class FilterSpec(BaseModel):
+  model_config = _REQUEST_CONFIG
+
   field: str
   op: Literal["eq", "neq", "lt", "lte", "gt", "gte", "contains", "in", "isnull", "notnull", "between"]
   value: Any | None = None
 
 
+# Dump whole filter/sort lists in one pydantic-core call instead of per-item model_dump().
+FILTERS_ADAPTER = TypeAdapter(list[FilterSpec])
+SORT_ADAPTER = TypeAdapter(list[SortSpec])
+
+
 class RowsQueryIn(BaseModel):
+  model_config = _REQUEST_CONFIG
+
   offset: int = 0
   limit: int = 200
   filters: list[FilterSpec] = Field(default_factory=list)
@@ -239,17 +253,19 @@ class ReshapeReportOut(BaseModel):
 
 
 class ExportIn(BaseModel):
-  format: Literal["csv", "dta"] = "csv"
+  format: Literal["csv", "dta", "parquet"] = "csv"
 
 
 class ExportOut(BaseModel):
-  format: Literal["csv", "dta"]
+  format: Literal["csv", "dta", "parquet"]
   filename: str
   downloadUrl: str
   timestamp: datetime
 
 
 class CleanIn(BaseModel):
+  model_config = _REQUEST_CONFIG
+
   action: Literal["drop-missing", "fill-mean", "fill-median", "trim", "lowercase", "standardize-missing"]
   fields: list[str]
   filters: list[FilterSpec] = Field(default_factory=list)
@@ -262,6 +278,8 @@ class CleanOut(BaseModel):
 
 
 class CleanPreviewIn(BaseModel):
+  model_config = _REQUEST_CONFIG
+
   action: str
   fields: list[str]
   filters: list[FilterSpec] = Field(default_factory=list)
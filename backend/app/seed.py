@@ -1,25 +1,90 @@
 from __future__ import annotations
 
-import shutil
+import os
+import threading
+import traceback
 from pathlib import Path
 
-from .db import connect
-from .services import create_relation, import_csv, merge_tables, refresh_inference, reshape_table, set_primary_key
+from .db import connect, transaction
+from .services import create_relations, import_csv, merge_tables, refresh_inference, reshape_table, set_primary_keys
 from .settings import Settings
 from .storage import (
+  create_project_dirs,
   project_db_path,
-  project_exports_dir,
-  project_files_dir,
+  projects_root,
   write_project_manifest,
   list_project_manifests,
 )
-from .utils import ensure_dir, new_id, utcnow
+from .utils import new_id, new_ids, utcnow
+
+
+# Resolved once at import; the seed set is fixed for the lifetime of the process.
+_SEEDS_DIR = Path(__file__).resolve().parents[1] / "seeds"
+_SEED_FILES = (
+  "customers.csv",
+  "categories.csv",
+  "products.csv",
+  "orders.csv",
+  "order_items.csv",
+  "monthly_sales_wide.csv",
+)
+
+_INSERT_SEED_FILE_SQL = """
+  insert into dw_meta.files (id, name, type, size, stored_path, created_at, updated_at, is_shared)
+  values (?, ?, 'csv', ?, ?, ?, ?, true)
+"""
+
+# projects root -> (its mtime_ns, project id) from the last check. Creating or deleting a
+# project directory changes the root's mtime, which invalidates the entry.
+_demo_check_cache: dict[Path, tuple[int, str]] = {}
+
+
+# Sibling cursors profiling seeded tables concurrently; the seed transaction has committed
+# by the time inference runs, so they see every table.
+INFERENCE_WORKERS = 8
+
+# db path -> event set once the deferred inference pass of a freshly seeded project is done.
+_pending_inference: dict[str, threading.Event] = {}
+
+
+def wait_for_seed_inference(db_path: Path) -> None:
+  ready = _pending_inference.get(str(db_path))
+  if ready is not None:
+    ready.wait()
+
+
+def _deferred_inference(db_path: Path, ready: threading.Event) -> None:
+  try:
+    with connect(db_path) as conn, transaction(conn):
+      refresh_inference(conn, workers=INFERENCE_WORKERS)
+  except Exception:
+    print(f"[data-weaver] seed inference failed db={db_path}")
+    traceback.print_exc()
+  finally:
+    ready.set()
+    _pending_inference.pop(str(db_path), None)
+
+
+def _projects_root_mtime(settings: Settings) -> int | None:
+  try:
+    return os.stat(projects_root(settings)).st_mtime_ns
+  except FileNotFoundError:
+    return None
 
 
 def ensure_demo_project(settings: Settings) -> str:
+  root = projects_root(settings)
+  mtime = _projects_root_mtime(settings)
+  cached = _demo_check_cache.get(root)
+  if cached is not None and mtime is not None and cached[0] == mtime:
+    return cached[1]
+
   existing = list_project_manifests(settings)
   if existing:
-    return str(existing[0]["id"])
+    project_id = str(existing[0]["id"])
+    if mtime is not None:
+      _demo_check_cache[root] = (mtime, project_id)
+    return project_id
 
   project_id = new_id("proj")
   now = utcnow()
@@ -30,98 +95,90 @@ def ensure_demo_project(settings: Settings) -> str:
     "updatedAt": now.isoformat(),
     "tags": ["demo", "ecommerce", "sales"],
   }
+  create_project_dirs(settings, project_id)
   write_project_manifest(settings, project_id, manifest)
-  ensure_dir(project_files_dir(settings, project_id))
-  ensure_dir(project_exports_dir(settings, project_id))
 
   db_path = project_db_path(settings, project_id)
-  ensure_dir(db_path.parent)
-
-  seeds_dir = Path(__file__).resolve().parents[1] / "seeds"
-  if not seeds_dir.exists():
-    raise RuntimeError("Seed files missing")
 
-  seed_files = [
-    "customers.csv",
-    "categories.csv",
-    "products.csv",
-    "orders.csv",
-    "order_items.csv",
-    "monthly_sales_wide.csv",
-  ]
+  try:
+    # One readdir; DirEntry.stat() is served from the cached entry where the OS allows.
+    with os.scandir(_SEEDS_DIR) as entries:
+      available = {entry.name: entry for entry in entries}
+  except FileNotFoundError:
+    raise RuntimeError("Seed files missing") from None
+
+  # Seeds are immutable shipped files, so they are registered in place (is_shared) rather
+  # than copied into the project directory.
+  missing = [name for name in _SEED_FILES if name not in available]
+  if missing:
+    raise RuntimeError(f"Missing seed files: {', '.join(missing)}")
+  file_ids = new_ids("file", len(_SEED_FILES))
+  planned: list[tuple[str, str, str, int]] = []
+  for seed_name, file_id in zip(_SEED_FILES, file_ids):
+    entry = available[seed_name]
+    planned.append((seed_name, file_id, entry.path, entry.stat().st_size))
 
   table_ids: dict[str, str] = {}
 
-  with connect(db_path) as conn:
-    for seed_name in seed_files:
-      src = seeds_dir / seed_name
-      if not src.exists():
-        raise RuntimeError(f"Missing seed file: {seed_name}")
-      file_id = new_id("file")
-      stored = project_files_dir(settings, project_id) / f"{file_id}_{seed_name}"
-      shutil.copyfile(src, stored)
-      size = stored.stat().st_size
-      now2 = utcnow()
-      conn.execute(
-        """
-        insert into dw_meta.files (id, name, type, size, stored_path, created_at, updated_at)
-        values (?, ?, 'csv', ?, ?, ?, ?)
-        """,
-        [file_id, seed_name, size, str(stored), now2, now2],
-      )
-
-      table_id = new_id("table")
+  # One transaction for the whole seed: a single commit instead of one per statement.
+  with connect(db_path) as conn, transaction(conn):
+    # The seed files are registered as one batch, so they share one timestamp; list_files
+    # breaks the tie by insertion order.
+    batch_now = utcnow()
+    rows = [[file_id, seed_name, size, src, batch_now, batch_now] for seed_name, file_id, src, size in planned]
+    # One prepared INSERT bound once per seed row.
+    conn.executemany(_INSERT_SEED_FILE_SQL, rows)
+
+    for (seed_name, file_id, src, _size), table_id in zip(planned, new_ids("table", len(planned))):
       table_name = Path(seed_name).stem
-      import_csv(conn, file_id, table_id, table_name, stored)
+      import_csv(conn, file_id, table_id, table_name, Path(src))
       table_ids[table_name] = table_id
 
     # Primary keys
-    set_primary_key(conn, table_ids["customers"], ["customer_id"])
-    set_primary_key(conn, table_ids["categories"], ["category_id"])
-    set_primary_key(conn, table_ids["products"], ["product_id"])
-    set_primary_key(conn, table_ids["orders"], ["order_id"])
-    set_primary_key(conn, table_ids["order_items"], ["item_id"])
-
-    # Relations (FK -> PK)
-    create_relation(
-      conn,
-      {
-        "fkTableId": table_ids["products"],
-        "fkFields": ["category_id"],
-        "pkTableId": table_ids["categories"],
-        "pkFields": ["category_id"],
-        "cardinality": "m:1",
-      },
-    )
-    create_relation(
+    set_primary_keys(
       conn,
-      {
-        "fkTableId": table_ids["orders"],
-        "fkFields": ["customer_id"],
-        "pkTableId": table_ids["customers"],
-        "pkFields": ["customer_id"],
-        "cardinality": "m:1",
-      },
+      [
+        (table_ids["customers"], ["customer_id"]),
+        (table_ids["categories"], ["category_id"]),
+        (table_ids["products"], ["product_id"]),
+        (table_ids["orders"], ["order_id"]),
+        (table_ids["order_items"], ["item_id"]),
+      ],
     )
-    create_relation(
-      conn,
-      {
-        "fkTableId": table_ids["order_items"],
-        "fkFields": ["order_id"],
-        "pkTableId": table_ids["orders"],
-        "pkFields": ["order_id"],
-        "cardinality": "m:1",
-      },
-    )
-    create_relation(
+
+    # Relations (FK -> PK)
+    create_relations(
       conn,
-      {
-        "fkTableId": table_ids["order_items"],
-        "fkFields": ["product_id"],
-        "pkTableId": table_ids["products"],
-        "pkFields": ["product_id"],
-        "cardinality": "m:1",
-      },
+      [
+        {
+          "fkTableId": table_ids["products"],
+          "fkFields": ["category_id"],
+          "pkTableId": table_ids["categories"],
+          "pkFields": ["category_id"],
+          "cardinality": "m:1",
+        },
+        {
+          "fkTableId": table_ids["orders"],
+          "fkFields": ["customer_id"],
+          "pkTableId": table_ids["customers"],
+          "pkFields": ["customer_id"],
+          "cardinality": "m:1",
+        },
+        {
+          "fkTableId": table_ids["order_items"],
+          "fkFields": ["order_id"],
+          "pkTableId": table_ids["orders"],
+          "pkFields": ["order_id"],
+          "cardinality": "m:1",
+        },
+        {
+          "fkTableId": table_ids["order_items"],
+          "fkFields": ["product_id"],
+          "pkTableId": table_ids["products"],
+          "pkFields": ["product_id"],
+          "cardinality": "m:1",
+        },
+      ],
     )
 
     # Create derived tables for lineage demo
@@ -151,7 +208,13 @@ def ensure_demo_project(settings: Settings) -> str:
       },
     )
 
-    # Ensure nullable/unique/identity + inferred relations are ready immediately.
-    refresh_inference(conn)
+  # Nullable/unique/identity profiles and inferred relations aren't needed for the return
+  # value; they are computed after the commit while routes wait on wait_for_seed_inference.
+  ready = threading.Event()
+  _pending_inference[str(db_path)] = ready
+  threading.Thread(target=_deferred_inference, args=(db_path, ready), daemon=True).start()
 
+  mtime = _projects_root_mtime(settings)
+  if mtime is not None:
+    _demo_check_cache[root] = (mtime, project_id)
   return project_id
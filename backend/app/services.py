@@ -2,15 +2,23 @@ from __future__ import annotations
 
 import hashlib
 import json
+import threading
+import time
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Literal
+from typing import Any, Iterator, Literal
 
 import duckdb
+import orjson
 import pandas as pd
-import polars as pl
+import pyarrow as pa
+import pyarrow.compute as pc
 import pyreadstat
 
-from .db import connect
+from .db import after_commit, connect
 from .schemas import FieldOut
 from .utils import dedupe_names, new_id, quote_ident, sanitize_stata_varname, utcnow
 
@@ -39,7 +47,7 @@ def _duck_type_to_field_type(duck_type: str) -> str:
 
 
 def _json_dumps(obj: Any) -> str:
-    return json.dumps(obj, ensure_ascii=False, default=str)
+    return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS).decode()
 
 
 def _active_physical_name(conn: duckdb.DuckDBPyConnection, table_id: str) -> str:
@@ -57,80 +65,235 @@ def _active_physical_name(conn: duckdb.DuckDBPyConnection, table_id: str) -> str
     return row[0]
 
 
+# physical name -> columns. A physical table is never altered once created (every change
+# writes a new version) and its name embeds the table's uuid and version, so entries can't
+# collide across projects. A name can still come back, e.g. a clean's next version after a
+# rolled-back clean, so every statement creating a physical table drops its entry first, and
+# version switches (undo) drop the entries of the table's versions. The cache is per
+# process; other processes never see a table whose creation rolled back, so they can't have
+# cached one.
+_COLUMNS_CACHE_MAX = 4096
+_columns_cache: dict[str, list[tuple[str, str, bool]]] = {}
+
+
+# physical name -> its column names, for the field checks every request starts with; shares
+# the invalidation of _columns_cache.
+_column_names_cache: dict[str, frozenset[str]] = {}
+
+
+def _forget_columns(physical: str) -> None:
+    _columns_cache.pop(physical, None)
+    _column_names_cache.pop(physical, None)
+
+
+def _column_names(conn: duckdb.DuckDBPyConnection, physical: str) -> frozenset[str]:
+    names = _column_names_cache.get(physical)
+    if names is None:
+        names = frozenset(c[0] for c in _list_columns(conn, physical))
+        if len(_column_names_cache) >= _COLUMNS_CACHE_MAX:
+            _column_names_cache.clear()
+        _column_names_cache[physical] = names
+    return names
+
+
 def _list_columns(conn: duckdb.DuckDBPyConnection, physical: str) -> list[tuple[str, str, bool]]:
+    cached = _columns_cache.get(physical)
+    if cached is not None:
+        return list(cached)
     rows = conn.execute(f"pragma table_info('{physical}')").fetchall()
     out: list[tuple[str, str, bool]] = []
     for _, name, col_type, notnull, *_ in rows:
         out.append((name, col_type, not bool(notnull)))
-    return out
+    if len(_columns_cache) >= _COLUMNS_CACHE_MAX:
+        _columns_cache.clear()
+    _columns_cache[physical] = out
+    return list(out)
 
 
 def _missing_count(conn: duckdb.DuckDBPyConnection, physical: str, col: str) -> int:
-    q = f"select sum(case when {quote_ident(col)} is null then 1 else 0 end) from {quote_ident(physical)}"
+    q = f"select count_if({quote_ident(col)} is null) from {quote_ident(physical)}"
     return int(conn.execute(q).fetchone()[0] or 0)
 
 
+# Upper-cased DuckDB type -> SQL template over the quoted column ({qt}); types not listed
+# fall back to the plain null check / the bare column.
+_MISSING_TMPL: dict[str, str] = {
+    **dict.fromkeys(("VARCHAR", "TEXT"), "{qt} is null or trim(cast({qt} as varchar)) = ''"),
+    **dict.fromkeys(("DOUBLE", "FLOAT", "FLOAT8", "REAL", "DECIMAL"), "{qt} is null or isnan({qt})"),
+}
+_DISTINCT_TMPL: dict[str, str] = {
+    **dict.fromkeys(("VARCHAR", "TEXT"), "nullif(trim(cast({qt} as varchar)), '')"),
+    **dict.fromkeys(
+        ("DOUBLE", "FLOAT", "FLOAT8", "REAL", "DECIMAL"), "case when {qt} is null or isnan({qt}) then null else {qt} end"
+    ),
+}
+
+
 def _missing_predicate(col: str, duck_type: str) -> str:
-    qt = quote_ident(col)
-    t = duck_type.upper()
-    if t in {"VARCHAR", "TEXT"}:
-        return f"{qt} is null or trim(cast({qt} as varchar)) = ''"
-    if t in {"DOUBLE", "FLOAT", "FLOAT8", "REAL", "DECIMAL"}:
-        return f"{qt} is null or isnan({qt})"
-    return f"{qt} is null"
+    return _MISSING_TMPL.get(duck_type.upper(), "{qt} is null").format(qt=quote_ident(col))
 
 
 def _distinct_value_expr(col: str, duck_type: str) -> str:
+    return _DISTINCT_TMPL.get(duck_type.upper(), "{qt}").format(qt=quote_ident(col))
+
+
+_IDENTITY_TYPES = {"INTEGER", "INT", "INT4", "BIGINT", "INT8"}
+
+_NUMERIC_TYPES = {
+    "TINYINT", "SMALLINT", "INTEGER", "BIGINT", "HUGEINT",
+    "UTINYINT", "USMALLINT", "UINTEGER", "UBIGINT", "UHUGEINT",
+    "FLOAT", "DOUBLE", "DECIMAL",
+}
+
+
+def _is_numeric_type(duck_type: str) -> bool:
+    # pragma table_info reports canonical names; DECIMAL carries its (width,scale).
+    return duck_type.upper().split("(", 1)[0] in _NUMERIC_TYPES
+
+
+# Text placeholders standardize-missing treats as missing (compared trimmed, lowercased).
+_MISSING_TOKENS = frozenset({"", "na", "n/a", "null", "none", "nan", "-", "—", "--", "?", "9999"})
+_MISSING_TOKENS_SQL = ", ".join(f"'{t}'" for t in sorted(_MISSING_TOKENS))
+
+
+def _missing_token_cond(col: str) -> str:
     qt = quote_ident(col)
-    t = duck_type.upper()
-    if t in {"VARCHAR", "TEXT"}:
-        return f"nullif(trim(cast({qt} as varchar)), '')"
-    if t in {"DOUBLE", "FLOAT", "FLOAT8", "REAL", "DECIMAL"}:
-        return f"case when {qt} is null or isnan({qt}) then null else {qt} end"
-    return qt
+    return f"{qt} is not null and lower(trim(cast({qt} as varchar))) in ({_MISSING_TOKENS_SQL})"
+
+
+# Above this many rows distinct counts use DuckDB's HyperLogLog sketch instead of an exact
+# hash table. The sketch is only good to roughly +/-25% here, so it screens uniqueness
+# rather than deciding it: columns that could still be unique get an exact recount.
+APPROX_DISTINCT_THRESHOLD = 1_000_000
+_APPROX_UNIQUE_SCREEN = 0.5
+
+
+def _count_distinct_sql(expr: str, row_count: int) -> str:
+    if row_count > APPROX_DISTINCT_THRESHOLD:
+        return f"approx_count_distinct({expr})"
+    return f"count(distinct {expr})"
+
+
+def _profile_columns(
+    conn: duckdb.DuckDBPyConnection, physical: str, cols: list[tuple[str, str, bool]], row_count_hint: int = 0
+) -> tuple[int, list[tuple[int, int, bool]]]:
+    # Every statistic for every column comes out of one aggregate query, so the table is
+    # scanned once rather than two or three times per column. row_count_hint is the table's
+    # row count when known up front; it selects exact vs. approximate distinct counting.
+    exprs = ["count(*)"]
+    for col_name, col_type, _ in cols:
+        exprs.append(f"count_if({_missing_predicate(col_name, col_type)})")
+        exprs.append(_count_distinct_sql(_distinct_value_expr(col_name, col_type), row_count_hint))
+        if col_type.upper() in _IDENTITY_TYPES:
+            qt = quote_ident(col_name)
+            exprs.append(f"min({qt})")
+            exprs.append(f"max({qt})")
+    row = conn.execute(f"select {', '.join(exprs)} from {quote_ident(physical)}").fetchone()
+
+    row_count = int(row[0] or 0)
+    missing: list[int] = []
+    distinct: list[int] = []
+    bounds: list[tuple[int | None, int | None] | None] = []
+    i = 1
+    for _col_name, col_type, _ in cols:
+        missing.append(int(row[i] or 0))
+        distinct.append(int(row[i + 1] or 0))
+        i += 2
+        if col_type.upper() in _IDENTITY_TYPES:
+            vmin, vmax = row[i], row[i + 1]
+            bounds.append((int(vmin) if vmin is not None else None, int(vmax) if vmax is not None else None))
+            i += 2
+        else:
+            bounds.append(None)
+
+    if row_count_hint > APPROX_DISTINCT_THRESHOLD:
+        candidates = [
+            k for k in range(len(cols)) if missing[k] == 0 and distinct[k] >= _APPROX_UNIQUE_SCREEN * row_count
+        ]
+        if candidates:
+            exact = conn.execute(
+                "select "
+                + ", ".join(f"count(distinct {_distinct_value_expr(cols[k][0], cols[k][1])})" for k in candidates)
+                + f" from {quote_ident(physical)}"
+            ).fetchone()
+            for k, value in zip(candidates, exact):
+                distinct[k] = int(value or 0)
+
+    stats: list[tuple[int, int, bool]] = []
+    for k in range(len(cols)):
+        is_identity = False
+        if bounds[k] is not None:
+            vmin, vmax = bounds[k]
+            is_unique = bool(row_count > 0 and missing[k] == 0 and distinct[k] == row_count)
+            if is_unique and vmin in {0, 1} and vmax is not None and (vmax - vmin + 1) == row_count:
+                is_identity = True
+        stats.append((missing[k], distinct[k], is_identity))
+    return row_count, stats
+
 
+def _profile_columns_parallel(
+    conn: duckdb.DuckDBPyConnection,
+    physical: str,
+    cols: list[tuple[str, str, bool]],
+    workers: int,
+    row_count_hint: int = 0,
+) -> tuple[int, list[tuple[int, int, bool]]]:
+    # Columns are split into one group per worker; each group is profiled with a single
+    # fused scan on its own cursor (a sibling connection to the same database), since a
+    # DuckDB connection must never be used from two threads at once.
+    n = min(workers, len(cols))
+    groups = [cols[i::n] for i in range(n)]
+
+    def run(group: list[tuple[str, str, bool]]) -> tuple[int, list[tuple[int, int, bool]]]:
+        cur = conn.cursor()
+        try:
+            return _profile_columns(cur, physical, group, row_count_hint)
+        finally:
+            cur.close()
+
+    with ThreadPoolExecutor(max_workers=n) as pool:
+        results = list(pool.map(run, groups))
+
+    # Undo the round-robin split so stats line up with cols again.
+    stats: list[tuple[int, int, bool]] = [(0, 0, False)] * len(cols)
+    for g, (_row_count, group_stats) in enumerate(results):
+        stats[g::n] = group_stats
+    return results[0][0], stats
 
-def refresh_column_profiles(conn: duckdb.DuckDBPyConnection, table_id: str) -> None:
+
+def refresh_column_profiles(conn: duckdb.DuckDBPyConnection, table_id: str, workers: int = 1) -> None:
+    # workers > 1 fans column groups out over sibling cursors. Those only see committed
+    # data, so only use it when the table isn't part of an open transaction.
     physical = _active_physical_name(conn, table_id)
-    row_count = int(conn.execute(f"select count(*) from {quote_ident(physical)}").fetchone()[0] or 0)
     cols = _list_columns(conn, physical)
+    row_count, stats = _compute_column_profiles(conn, physical, cols, workers)
+    _write_column_profiles(conn, table_id, cols, row_count, stats)
+
+
+def _compute_column_profiles(
+    conn: duckdb.DuckDBPyConnection, physical: str, cols: list[tuple[str, str, bool]], workers: int = 1
+) -> tuple[int, list[tuple[int, int, bool]]]:
+    # Cheap next to the profiling scan; decides whether distinct counts can be approximate.
+    total = int(conn.execute(f"select count(*) from {quote_ident(physical)}").fetchone()[0] or 0)
+    if workers > 1 and len(cols) > 1:
+        return _profile_columns_parallel(conn, physical, cols, workers, total)
+    return _profile_columns(conn, physical, cols, total)
 
+
+def _write_column_profiles(
+    conn: duckdb.DuckDBPyConnection,
+    table_id: str,
+    cols: list[tuple[str, str, bool]],
+    row_count: int,
+    stats: list[tuple[int, int, bool]],
+) -> None:
     conn.execute("delete from dw_meta.column_profiles where table_id = ?", [table_id])
     now = utcnow()
-    for col_name, col_type, _nullable_from_schema in cols:
-        missing_pred = _missing_predicate(col_name, col_type)
-        missing_count = int(
-            conn.execute(
-                f"select sum(case when {missing_pred} then 1 else 0 end) from {quote_ident(physical)}"
-            ).fetchone()[0]
-            or 0
-        )
-        distinct_count = int(
-            conn.execute(
-                f"select count(distinct {_distinct_value_expr(col_name, col_type)}) from {quote_ident(physical)}"
-            ).fetchone()[0]
-            or 0
-        )
+    rows: list[list[Any]] = []
+    for (col_name, _col_type, _nullable_from_schema), (missing_count, distinct_count, is_identity) in zip(cols, stats):
         inferred_nullable = missing_count > 0
         is_unique = bool(row_count > 0 and missing_count == 0 and distinct_count == row_count)
-
-        is_identity = False
-        t = col_type.upper()
-        if is_unique and t in {"INTEGER", "INT", "INT4", "BIGINT", "INT8"} and row_count > 0:
-            minmax = conn.execute(
-                f"select min({quote_ident(col_name)}), max({quote_ident(col_name)}) from {quote_ident(physical)}"
-            ).fetchone()
-            vmin = int(minmax[0]) if minmax[0] is not None else None
-            vmax = int(minmax[1]) if minmax[1] is not None else None
-            if vmin in {0, 1} and vmax is not None and (vmax - vmin + 1) == row_count:
-                is_identity = True
-
-        conn.execute(
-            """
-            insert into dw_meta.column_profiles
-              (table_id, column_name, row_count, missing_count, distinct_count, is_unique, is_identity, inferred_nullable, updated_at)
-            values (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """,
+        rows.append(
             [
                 table_id,
                 col_name,
@@ -141,8 +304,30 @@ def refresh_column_profiles(conn: duckdb.DuckDBPyConnection, table_id: str) -> N
                 bool(is_identity),
                 bool(inferred_nullable),
                 now,
-            ],
+            ]
+        )
+    if rows:
+        conn.executemany(
+            """
+            insert into dw_meta.column_profiles
+              (table_id, column_name, row_count, missing_count, distinct_count, is_unique, is_identity, inferred_nullable, updated_at)
+            values (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            rows,
         )
+    _forget_table_meta(conn, table_id)
+
+
+def _profile_row_to_dict(row: tuple[Any, ...]) -> dict[str, Any]:
+    row_count, missing_count, distinct_count, is_unique, is_identity, inferred_nullable = row
+    return {
+        "row_count": int(row_count),
+        "missing_count": int(missing_count),
+        "distinct_count": int(distinct_count),
+        "is_unique": bool(is_unique),
+        "is_identity": bool(is_identity),
+        "inferred_nullable": bool(inferred_nullable),
+    }
 
 
 def _load_column_profiles(conn: duckdb.DuckDBPyConnection, table_id: str) -> dict[str, dict[str, Any]]:
@@ -154,29 +339,19 @@ def _load_column_profiles(conn: duckdb.DuckDBPyConnection, table_id: str) -> dic
         """,
         [table_id],
     ).fetchall()
-    out: dict[str, dict[str, Any]] = {}
-    for name, row_count, missing_count, distinct_count, is_unique, is_identity, inferred_nullable in rows:
-        out[str(name)] = {
-            "row_count": int(row_count),
-            "missing_count": int(missing_count),
-            "distinct_count": int(distinct_count),
-            "is_unique": bool(is_unique),
-            "is_identity": bool(is_identity),
-            "inferred_nullable": bool(inferred_nullable),
-        }
-    return out
+    return {str(name): _profile_row_to_dict(tuple(prof)) for name, *prof in rows}
 
 
 def _load_primary_key_fields(conn: duckdb.DuckDBPyConnection, table_id: str) -> list[str] | None:
     row = conn.execute("select fields_json from dw_meta.primary_keys where table_id = ?", [table_id]).fetchone()
     if row:
-        return list(json.loads(row[0]))
+        return list(orjson.loads(row[0]))
     row = conn.execute(
         "select fields_json from dw_meta.primary_keys_inferred where table_id = ?",
         [table_id],
     ).fetchone()
     if row:
-        return list(json.loads(row[0]))
+        return list(orjson.loads(row[0]))
     return None
 
 
@@ -194,6 +369,7 @@ def refresh_inferred_primary_key(conn: duckdb.DuckDBPyConnection, table_id: str)
     ]
     if not candidates:
         conn.execute("delete from dw_meta.primary_keys_inferred where table_id = ?", [table_id])
+        _forget_table_meta(conn, table_id)
         return None
 
     def rank(name: str) -> tuple[int, str]:
@@ -210,12 +386,15 @@ def refresh_inferred_primary_key(conn: duckdb.DuckDBPyConnection, table_id: str)
         "insert or replace into dw_meta.primary_keys_inferred (table_id, fields_json, created_at) values (?, ?, ?)",
         [table_id, _json_dumps(fields), utcnow()],
     )
+    _forget_table_meta(conn, table_id)
     return fields
 
 
 def _stable_relation_id(fk_table_id: str, fk_fields: list[str], pk_table_id: str, pk_fields: list[str]) -> str:
     raw = f"{fk_table_id}|{json.dumps(fk_fields, ensure_ascii=False)}|{pk_table_id}|{json.dumps(pk_fields, ensure_ascii=False)}"
-    h = hashlib.sha1(raw.encode("utf-8")).hexdigest()
+    # Not a security boundary, only a deterministic id: the 128-bit BLAKE2b digest is cheaper
+    # than SHA-1 and its 32 hex chars can't collide with the older 40-char ids.
+    h = hashlib.blake2b(raw.encode("utf-8"), digest_size=16).hexdigest()
     return f"rel-inf-{h}"
 
 
@@ -242,6 +421,9 @@ def refresh_inferred_relations(conn: duckdb.DuckDBPyConnection, coverage_thresho
             refresh_column_profiles(conn, tid)
         refresh_inferred_primary_key(conn, tid)
 
+    profiles = {tid: _load_column_profiles(conn, tid) for tid in table_ids}
+    physicals = {tid: _active_physical_name(conn, tid) for tid in table_ids}
+
     # Build candidate PK columns by table (single-column only for MVP inference).
     pk_candidates: dict[str, set[str]] = {}
     for tid in table_ids:
@@ -249,96 +431,150 @@ def refresh_inferred_relations(conn: duckdb.DuckDBPyConnection, coverage_thresho
         if fields and len(fields) == 1:
             pk_candidates[tid] = {fields[0]}
             continue
-        prof = _load_column_profiles(conn, tid)
         pk_candidates[tid] = {
             c
-            for c, p in prof.items()
+            for c, p in profiles[tid].items()
             if p["row_count"] > 0 and p["is_unique"] and (not p["inferred_nullable"])
         }
 
-    conn.execute("delete from dw_meta.relation_edges_inferred")
-    now = utcnow()
+    # Inverted index: column name -> tables where it is a PK candidate. Only FK columns
+    # that appear here yield (fk, pk, column) pairs worth a coverage query.
+    pk_tids_by_col: dict[str, list[str]] = {}
+    for tid in table_ids:
+        for col in pk_candidates[tid]:
+            pk_tids_by_col.setdefault(col, []).append(tid)
 
-    # Infer FK->PK edges where a column name matches a PK-candidate in another table,
-    # and actual data shows high coverage (facts-based).
+    order = {tid: i for i, tid in enumerate(table_ids)}
+    pairs: list[tuple[str, str, str]] = []
     for fk_tid in table_ids:
-        fk_physical = _active_physical_name(conn, fk_tid)
-        fk_cols = {c[0] for c in _list_columns(conn, fk_physical)}
-        fk_profiles = _load_column_profiles(conn, fk_tid)
-
-        for pk_tid in table_ids:
-            if pk_tid == fk_tid:
-                continue
-            pk_cols = pk_candidates.get(pk_tid) or set()
-            if not pk_cols:
+        for col_name, _col_type, _nullable in _list_columns(conn, physicals[fk_tid]):
+            fk_prof = profiles[fk_tid].get(col_name)
+            # Skip if FK column is entirely missing.
+            if not fk_prof or fk_prof["distinct_count"] == 0:
                 continue
+            for pk_tid in pk_tids_by_col.get(col_name, ()):
+                if pk_tid != fk_tid:
+                    pairs.append((fk_tid, pk_tid, col_name))
+    # Same visiting order as a plain fk x pk x sorted(shared columns) loop.
+    pairs.sort(key=lambda p: (order[p[0]], order[p[1]], p[2]))
 
-            pk_physical = _active_physical_name(conn, pk_tid)
-            for shared_col in sorted(set(fk_cols) & set(pk_cols)):
-                # Skip if FK column is entirely missing.
-                fk_prof = fk_profiles.get(shared_col)
-                if not fk_prof or fk_prof["distinct_count"] == 0:
-                    continue
+    conn.execute("delete from dw_meta.relation_edges_inferred")
+    now = utcnow()
 
-                fk_key = _normalized_key_expr(shared_col)
+    # Infer FK->PK edges where a column name matches a PK-candidate in another table,
+    # and actual data shows high coverage (facts-based). Each PK-side distinct key set is
+    # materialized once in a temp table and reused for every FK table probing it; an FK
+    # column probed against several PK tables gets its (key, count) pairs materialized too.
+    pk_key_tables: dict[tuple[str, str], str] = {}
+    fk_key_tables: dict[tuple[str, str], str] = {}
+    fk_probes = Counter((fk_tid, col) for fk_tid, _pk_tid, col in pairs)
+    try:
+        for fk_tid, pk_tid, shared_col in pairs:
+            key_table = pk_key_tables.get((pk_tid, shared_col))
+            if key_table is None:
+                key_table = f"_dw_pk_keys_{len(pk_key_tables)}"
                 pk_key = _normalized_key_expr(shared_col)
-
-                coverage_row = conn.execute(
-                    f"""
-                    with
-                      fk as (
-                        select {fk_key} as k
-                        from {quote_ident(fk_physical)}
-                        where {fk_key} is not null
-                      ),
-                      pk as (
-                        select distinct {pk_key} as k
-                        from {quote_ident(pk_physical)}
-                        where {pk_key} is not null
-                      )
-                    select
-                      sum(case when pk.k is not null then 1 else 0 end) as matched,
-                      count(*) as total
-                    from fk
-                    left join pk using (k)
-                    """
-                ).fetchone()
-                matched = int(coverage_row[0] or 0)
-                total = int(coverage_row[1] or 0)
-                if total == 0:
-                    continue
-                coverage = matched / total
-                if coverage < coverage_threshold:
-                    continue
-
-                # Cardinality: FK uniqueness determines 1:1 vs m:1 (FK -> PK direction).
-                cardinality = "1:1" if bool(fk_prof["is_unique"] and (not fk_prof["inferred_nullable"])) else "m:1"
-
-                rid = _stable_relation_id(fk_tid, [shared_col], pk_tid, [shared_col])
                 conn.execute(
+                    f"""
+                    create or replace temp table {key_table} as
+                    select distinct {pk_key} as k
+                    from {quote_ident(physicals[pk_tid])}
+                    where {pk_key} is not null
                     """
-                    insert or replace into dw_meta.relation_edges_inferred
-                      (id, fk_table_id, fk_fields_json, pk_table_id, pk_fields_json, cardinality, coverage, created_at)
-                    values (?, ?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    [
-                        rid,
-                        fk_tid,
-                        _json_dumps([shared_col]),
-                        pk_tid,
-                        _json_dumps([shared_col]),
-                        cardinality,
-                        float(coverage),
-                        now,
-                    ],
                 )
+                pk_key_tables[(pk_tid, shared_col)] = key_table
+
+            fk_key = _normalized_key_expr(shared_col)
+            fk_keys_sql = f"""
+                select {fk_key} as k, count(*) as n
+                from {quote_ident(physicals[fk_tid])}
+                where {fk_key} is not null
+                group by 1
+            """
+            fk_source = fk_key_tables.get((fk_tid, shared_col))
+            if fk_source is None and fk_probes[(fk_tid, shared_col)] > 1:
+                fk_source = f"_dw_fk_keys_{len(fk_key_tables)}"
+                conn.execute(f"create or replace temp table {fk_source} as {fk_keys_sql}")
+                fk_key_tables[(fk_tid, shared_col)] = fk_source
+            if fk_source is None:
+                fk_source = f"({fk_keys_sql})"
+            coverage_row = conn.execute(
+                f"""
+                select
+                  sum(fk.n) filter (where pk.k is not null) as matched,
+                  sum(fk.n) as total
+                from {fk_source} fk
+                left join {key_table} pk using (k)
+                """
+            ).fetchone()
+            matched = int(coverage_row[0] or 0)
+            total = int(coverage_row[1] or 0)
+            if total == 0:
+                continue
+            coverage = matched / total
+            if coverage < coverage_threshold:
+                continue
 
+            # Cardinality: FK uniqueness determines 1:1 vs m:1 (FK -> PK direction).
+            fk_prof = profiles[fk_tid][shared_col]
+            cardinality = "1:1" if bool(fk_prof["is_unique"] and (not fk_prof["inferred_nullable"])) else "m:1"
 
-def refresh_inference(conn: duckdb.DuckDBPyConnection) -> None:
+            rid = _stable_relation_id(fk_tid, [shared_col], pk_tid, [shared_col])
+            conn.execute(
+                """
+                insert or replace into dw_meta.relation_edges_inferred
+                  (id, fk_table_id, fk_fields_json, pk_table_id, pk_fields_json, cardinality, coverage, created_at)
+                values (?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                [
+                    rid,
+                    fk_tid,
+                    [shared_col],
+                    pk_tid,
+                    [shared_col],
+                    cardinality,
+                    float(coverage),
+                    now,
+                ],
+            )
+    finally:
+        # Temp tables live as long as the (pooled) connection; don't leave them behind. After
+        # a failed statement the open transaction is aborted and rolls them back anyway.
+        for key_table in [*pk_key_tables.values(), *fk_key_tables.values()]:
+            try:
+                conn.execute(f"drop table if exists {key_table}")
+            except duckdb.Error:
+                break
+        # Outside transaction() the delete has already committed, even if a probe failed.
+        _forget_table_meta(conn, *table_ids)
+
+
+def refresh_inference(conn: duckdb.DuckDBPyConnection, workers: int = 1) -> None:
+    # workers > 1 profiles tables concurrently on sibling cursors (committed data only, as
+    # with refresh_column_profiles); the profile/PK/relation writes stay on conn, in order.
     table_ids = [r[0] for r in conn.execute("select id from dw_meta.tables").fetchall()]
-    for tid in table_ids:
-        refresh_column_profiles(conn, tid)
-        refresh_inferred_primary_key(conn, tid)
+    if workers > 1 and len(table_ids) > 1:
+        targets: list[tuple[str, str, list[tuple[str, str, bool]]]] = []
+        for tid in table_ids:
+            physical = _active_physical_name(conn, tid)
+            targets.append((tid, physical, _list_columns(conn, physical)))
+
+        def run(target: tuple[str, str, list[tuple[str, str, bool]]]) -> tuple[int, list[tuple[int, int, bool]]]:
+            cur = conn.cursor()
+            try:
+                return _compute_column_profiles(cur, target[1], target[2])
+            finally:
+                cur.close()
+
+        with ThreadPoolExecutor(max_workers=min(workers, len(targets))) as pool:
+            results = list(pool.map(run, targets))
+        for (tid, _physical, cols), (row_count, stats) in zip(targets, results):
+            _write_column_profiles(conn, tid, cols, row_count, stats)
+            refresh_inferred_primary_key(conn, tid)
+    else:
+        for tid in table_ids:
+            refresh_column_profiles(conn, tid)
+            refresh_inferred_primary_key(conn, tid)
     refresh_inferred_relations(conn)
 
 
@@ -348,68 +584,46 @@ def _physical_name(table_id: str, version: int) -> str:
     return f"t_{safe}_v{version}"
 
 
-def get_table_meta(conn: duckdb.DuckDBPyConnection, table_id: str) -> dict[str, Any]:
-    table_row = conn.execute(
-        """
-        select id, name, source_type, source_file_id, dirty
-        from dw_meta.tables
-        where id = ?
-        """,
-        [table_id],
-    ).fetchone()
-    if not table_row:
-        raise KeyError(f"Unknown table_id: {table_id}")
+# One row per FK field: (fk_table_id, fk_field, pk_table_id, pk_field), the i-th FK field
+# pairing with the i-th PK field (or the last one). Explicit edges come before inferred ones
+# so the latter win per field; {where} is empty or a fk_table_id filter.
+_FK_REFS_SQL = """
+    select fk_table_id, fk_field, pk_table_id, pk_fields[least(i, len(pk_fields))] as pk_field
+    from (
+      select src, rid, fk_table_id, pk_table_id, pk_fields,
+        unnest(fk_fields) as fk_field, generate_subscripts(fk_fields, 1) as i
+      from (
+        select 0 as src, rowid as rid, fk_table_id, pk_table_id,
+          fk_fields_json as fk_fields, pk_fields_json as pk_fields
+        from dw_meta.relation_edges {where}
+        union all
+        select 1 as src, rowid as rid, fk_table_id, pk_table_id,
+          fk_fields_json as fk_fields, pk_fields_json as pk_fields
+        from dw_meta.relation_edges_inferred {where}
+      )
+    )
+    order by src, rid, i
+"""
 
-    physical = _active_physical_name(conn, table_id)
-    profiles = _load_column_profiles(conn, table_id)
-    if not profiles:
-        refresh_column_profiles(conn, table_id)
-        profiles = _load_column_profiles(conn, table_id)
 
+def _build_table_meta(
+    conn: duckdb.DuckDBPyConnection,
+    table_row: tuple[Any, ...],
+    physical: str,
+    profiles: dict[str, dict[str, Any]],
+    pk_fields: set[str],
+    fk_refs: list[tuple[str, str, str]],
+    cols: list[tuple[str, str, bool]],
+) -> dict[str, Any]:
     row_count = next(iter(profiles.values()), {}).get("row_count")
     if row_count is None:
         row_count = int(conn.execute(f"select count(*) from {quote_ident(physical)}").fetchone()[0] or 0)
     else:
         row_count = int(row_count)
 
-    pk_fields: set[str] = set()
-    pk_row = conn.execute("select fields_json from dw_meta.primary_keys where table_id = ?", [table_id]).fetchone()
-    if pk_row:
-        pk_fields = set(json.loads(pk_row[0]))
-    if not pk_fields:
-        pk_inf = conn.execute(
-            "select fields_json from dw_meta.primary_keys_inferred where table_id = ?",
-            [table_id],
-        ).fetchone()
-        if pk_inf:
-            pk_fields = set(json.loads(pk_inf[0]))
-
-    fk_rows = conn.execute(
-        """
-        select fk_fields_json, pk_table_id, pk_fields_json
-        from dw_meta.relation_edges
-        where fk_table_id = ?
-        """,
-        [table_id],
-    ).fetchall()
-    fk_rows_inf = conn.execute(
-        """
-        select fk_fields_json, pk_table_id, pk_fields_json
-        from dw_meta.relation_edges_inferred
-        where fk_table_id = ?
-        """,
-        [table_id],
-    ).fetchall()
-    fk_by_field: dict[str, tuple[str, str]] = {}
-    for fk_fields_json, pk_table_id, pk_fields_json in [*fk_rows, *fk_rows_inf]:
-        fk_fields = json.loads(fk_fields_json)
-        pk_fields_mapped = json.loads(pk_fields_json)
-        for i, fk_field in enumerate(fk_fields):
-            ref_field = pk_fields_mapped[min(i, len(pk_fields_mapped) - 1)]
-            fk_by_field[fk_field] = (pk_table_id, ref_field)
+    fk_by_field = {fk_field: (pk_table_id, pk_field) for fk_field, pk_table_id, pk_field in fk_refs}
 
     fields: list[FieldOut] = []
-    cols = _list_columns(conn, physical)
     for col_name, col_type, nullable in cols:
         prof = profiles.get(col_name)
         if prof:
@@ -449,17 +663,207 @@ def get_table_meta(conn: duckdb.DuckDBPyConnection, table_id: str) -> dict[str,
         "sourceType": table_row[2],
         "dirty": bool(table_row[4]),
         "sourceFileId": table_row[3],
+        # Emitted explicitly: GET /tables serializes these dicts without DataTableOut.
+        "derivedFrom": None,
+        "operation": None,
     }
 
 
+# table_id -> (stamp, cached_at, meta). Table ids are uuids, so entries can't collide across
+# projects. The stamp (active version id, updated_at, dirty) catches version switches and
+# cleans; profile, key and relation writers call _forget_table_meta once their writes are
+# done, and it takes effect when they commit. That bumps the generation, so a meta built
+# from the pre-commit state while the write was in flight isn't stored. The cache is per
+# process: another worker process only sees such a write after its TTL.
+_TABLE_META_TTL_SECONDS = 60.0
+_TABLE_META_CACHE_MAX = 1024
+_table_meta_cache: OrderedDict[str, tuple[tuple[Any, ...], float, dict[str, Any]]] = OrderedDict()
+_table_meta_lock = threading.Lock()
+_table_meta_generation = 0
+
+
+def _drop_table_meta(table_ids: tuple[str, ...]) -> None:
+    global _table_meta_generation
+    with _table_meta_lock:
+        _table_meta_generation += 1
+        for table_id in table_ids:
+            _table_meta_cache.pop(table_id, None)
+
+
+def _forget_table_meta(conn: duckdb.DuckDBPyConnection, *table_ids: str) -> None:
+    # Call after the writes: dropping entries before they commit would let a concurrent
+    # reader re-cache the old state under the new generation.
+    after_commit(conn, lambda: _drop_table_meta(table_ids))
+
+
+def _cached_table_meta(table_id: str, stamp: tuple[Any, ...]) -> dict[str, Any] | None:
+    with _table_meta_lock:
+        entry = _table_meta_cache.get(table_id)
+        if entry is None:
+            return None
+        cached_stamp, cached_at, meta = entry
+        if cached_stamp != stamp or time.monotonic() - cached_at > _TABLE_META_TTL_SECONDS:
+            del _table_meta_cache[table_id]
+            return None
+        _table_meta_cache.move_to_end(table_id)
+    # Callers may mutate what they get back; the field dicts are the only nested state.
+    return {**meta, "fields": [dict(f) for f in meta["fields"]]}
+
+
+def _store_table_meta(table_id: str, stamp: tuple[Any, ...], meta: dict[str, Any], generation: int) -> None:
+    with _table_meta_lock:
+        if generation != _table_meta_generation:
+            return
+        _table_meta_cache[table_id] = (stamp, time.monotonic(), {**meta, "fields": [dict(f) for f in meta["fields"]]})
+        _table_meta_cache.move_to_end(table_id)
+        while len(_table_meta_cache) > _TABLE_META_CACHE_MAX:
+            _table_meta_cache.popitem(last=False)
+
+
+def get_table_meta(conn: duckdb.DuckDBPyConnection, table_id: str) -> dict[str, Any]:
+    row = conn.execute(
+        """
+        select t.id, t.name, t.source_type, t.source_file_id, t.dirty, v.physical_name, v.id, t.updated_at
+        from dw_meta.tables t
+        left join dw_meta.table_versions v on v.table_id = t.id and v.is_active = true
+        where t.id = ?
+        """,
+        [table_id],
+    ).fetchone()
+    if not row:
+        raise KeyError(f"Unknown table_id: {table_id}")
+    table_row, physical, stamp = row[:5], row[5], (row[6], row[7], row[4])
+    if physical is None:
+        raise KeyError(f"Unknown table_id: {table_id}")
+
+    cached = _cached_table_meta(table_id, stamp)
+    if cached is not None:
+        return cached
+
+    generation = _table_meta_generation
+    profiles = _load_column_profiles(conn, table_id)
+    if not profiles:
+        refresh_column_profiles(conn, table_id)
+        profiles = _load_column_profiles(conn, table_id)
+
+    pk_fields: set[str] = set()
+    pk_row = conn.execute("select fields_json from dw_meta.primary_keys where table_id = ?", [table_id]).fetchone()
+    if pk_row:
+        pk_fields = set(orjson.loads(pk_row[0]))
+    if not pk_fields:
+        pk_inf = conn.execute(
+            "select fields_json from dw_meta.primary_keys_inferred where table_id = ?",
+            [table_id],
+        ).fetchone()
+        if pk_inf:
+            pk_fields = set(orjson.loads(pk_inf[0]))
+
+    fk_refs = [
+        tuple(r[1:])
+        for r in conn.execute(_FK_REFS_SQL.format(where="where fk_table_id = ?"), [table_id, table_id]).fetchall()
+    ]
+
+    cols = _list_columns(conn, physical)
+    meta = _build_table_meta(conn, table_row, physical, profiles, pk_fields, fk_refs, cols)
+    _store_table_meta(table_id, stamp, meta, generation)
+    return meta
+
+
+def _list_columns_bulk(conn: duckdb.DuckDBPyConnection, physicals: list[str]) -> dict[str, list[tuple[str, str, bool]]]:
+    out = {p: list(_columns_cache[p]) for p in physicals if p in _columns_cache}
+    missing = [p for p in physicals if p not in out]
+    if missing:
+        rows = conn.execute(
+            """
+            select table_name, column_name, data_type, is_nullable
+            from duckdb_columns()
+            where database_name = current_database() and schema_name = 'main' and list_contains(?, table_name)
+            order by table_name, column_index
+            """,
+            [missing],
+        ).fetchall()
+        fetched: dict[str, list[tuple[str, str, bool]]] = {}
+        for table_name, col_name, col_type, is_nullable in rows:
+            fetched.setdefault(table_name, []).append((col_name, col_type, bool(is_nullable)))
+        for p, cols in fetched.items():
+            if len(_columns_cache) >= _COLUMNS_CACHE_MAX:
+                _columns_cache.clear()
+            _columns_cache[p] = cols
+            out[p] = list(cols)
+    return out
+
+
 def list_tables(conn: duckdb.DuckDBPyConnection) -> list[dict[str, Any]]:
-    rows = conn.execute("select id from dw_meta.tables order by updated_at desc").fetchall()
-    return [get_table_meta(conn, r[0]) for r in rows]
+    # One query per metadata relation for all tables, grouped by table id in Python, rather
+    # than get_table_meta's handful of lookups per table.
+    table_rows = conn.execute(
+        """
+        select t.id, t.name, t.source_type, t.source_file_id, t.dirty, v.physical_name, v.id, t.updated_at
+        from dw_meta.tables t
+        left join dw_meta.table_versions v on v.table_id = t.id and v.is_active = true
+        order by t.updated_at desc
+        """
+    ).fetchall()
+    if not table_rows:
+        return []
+
+    out: list[dict[str, Any] | None] = []
+    for row in table_rows:
+        out.append(_cached_table_meta(row[0], (row[6], row[7], row[4])) if row[5] is not None else None)
+    if all(meta is not None for meta in out):
+        return out  # type: ignore[return-value]
+    generation = _table_meta_generation
+
+    profiles_by_table: dict[str, dict[str, dict[str, Any]]] = {}
+    for table_id, col_name, *prof in conn.execute(
+        """
+        select table_id, column_name, row_count, missing_count, distinct_count, is_unique, is_identity, inferred_nullable
+        from dw_meta.column_profiles
+        """
+    ).fetchall():
+        profiles_by_table.setdefault(table_id, {})[str(col_name)] = _profile_row_to_dict(tuple(prof))
+
+    explicit_pks = dict(conn.execute("select table_id, fields_json from dw_meta.primary_keys").fetchall())
+    inferred_pks = dict(conn.execute("select table_id, fields_json from dw_meta.primary_keys_inferred").fetchall())
+
+    fk_by_table: dict[str, list[tuple[str, str, str]]] = {}
+    for fk_table_id, *ref in conn.execute(_FK_REFS_SQL.format(where="")).fetchall():
+        fk_by_table.setdefault(fk_table_id, []).append(tuple(ref))
+
+    cols_by_physical = _list_columns_bulk(
+        conn, [r[5] for r, meta in zip(table_rows, out) if meta is None and r[5] is not None]
+    )
+
+    for i, row in enumerate(table_rows):
+        if out[i] is not None:
+            continue
+        table_row, physical, stamp = row[:5], row[5], (row[6], row[7], row[4])
+        table_id = table_row[0]
+        if physical is None:
+            raise KeyError(f"Unknown table_id: {table_id}")
+        profiles = profiles_by_table.get(table_id)
+        if not profiles:
+            refresh_column_profiles(conn, table_id)
+            profiles = _load_column_profiles(conn, table_id)
+
+        pk_fields: set[str] = set()
+        if table_id in explicit_pks:
+            pk_fields = set(orjson.loads(explicit_pks[table_id]))
+        if not pk_fields and table_id in inferred_pks:
+            pk_fields = set(orjson.loads(inferred_pks[table_id]))
+
+        cols = cols_by_physical.get(physical)
+        if cols is None:
+            cols = _list_columns(conn, physical)
+        meta = _build_table_meta(conn, table_row, physical, profiles, pk_fields, fk_by_table.get(table_id, []), cols)
+        _store_table_meta(table_id, stamp, meta, generation)
+        out[i] = meta
+    return out  # type: ignore[return-value]
 
 
 def list_files(conn: duckdb.DuckDBPyConnection) -> list[dict[str, Any]]:
     rows = conn.execute(
-        "select id, name, type, size, updated_at from dw_meta.files order by updated_at desc"
+        "select id, name, type, size, updated_at from dw_meta.files order by updated_at desc, rowid desc"
     ).fetchall()
     return [
         {"id": r[0], "name": r[1], "type": r[2], "size": int(r[3]), "updatedAt": r[4]}
@@ -469,8 +873,11 @@ def list_files(conn: duckdb.DuckDBPyConnection) -> list[dict[str, Any]]:
 
 def import_csv(conn: duckdb.DuckDBPyConnection, file_id: str, table_id: str, table_name: str, csv_path: Path) -> None:
     physical = _physical_name(table_id, 1)
+    _forget_columns(physical)
+    # Parsing stays inside DuckDB's parallel CSV reader; sample_size=-1 infers types from
+    # the whole file so a late outlier row can't fail the load after a partial sample.
     conn.execute(
-        f"create table {quote_ident(physical)} as select * from read_csv_auto(?, header=true)",
+        f"create table {quote_ident(physical)} as select * from read_csv_auto(?, header=true, sample_size=-1)",
         [str(csv_path)],
     )
     now = utcnow()
@@ -492,7 +899,10 @@ def import_csv(conn: duckdb.DuckDBPyConnection, file_id: str, table_id: str, tab
 
 def import_xlsx(conn: duckdb.DuckDBPyConnection, file_id: str, table_id: str, table_name: str, xlsx_path: Path) -> None:
     physical = _physical_name(table_id, 1)
-    df = pd.read_excel(xlsx_path)
+    _forget_columns(physical)
+    # calamine parses the workbook in Rust; dtype inference is pandas' own, so the imported
+    # schema is the same as with openpyxl/xlrd. DuckDB scans the numpy-backed frame in place.
+    df = pd.read_excel(xlsx_path, engine="calamine")
     conn.register("tmp_import_df", df)
     conn.execute(f"create table {quote_ident(physical)} as select * from tmp_import_df")
     conn.unregister("tmp_import_df")
@@ -513,62 +923,143 @@ def import_xlsx(conn: duckdb.DuckDBPyConnection, file_id: str, table_id: str, ta
     )
 
 
-def query_rows(
+_COMPARISON_OPS = {
+    "eq": "=",
+    "neq": "!=",
+    "lt": "<",
+    "lte": "<=",
+    "gt": ">",
+    "gte": ">=",
+}
+
+
+@lru_cache(maxsize=256)
+def _rows_query_sql(
+    physical: str,
+    filter_shape: tuple[tuple[str, str, int], ...],
+    sort_shape: tuple[tuple[str, str], ...],
+) -> tuple[str, str]:
+    # SQL text depends only on the (table, filter-shape, sort) plan key; values are bound per call.
+    where_parts: list[str] = []
+    for field, op, arity in filter_shape:
+        if op == "isnull":
+            where_parts.append(f"{quote_ident(field)} is null")
+        elif op == "notnull":
+            where_parts.append(f"{quote_ident(field)} is not null")
+        elif op == "contains":
+            where_parts.append(f"{quote_ident(field)} ilike ?")
+        elif op == "in":
+            if arity == 0:
+                where_parts.append("false")
+            else:
+                where_parts.append(f"{quote_ident(field)} in ({','.join(['?'] * arity)})")
+        elif op == "between":
+            where_parts.append(f"{quote_ident(field)} between ? and ?")
+        else:
+            where_parts.append(f"{quote_ident(field)} {_COMPARISON_OPS[op]} ?")
+    where_sql = f"where {' and '.join(where_parts)}" if where_parts else ""
+    order_parts = [f"{quote_ident(field)} {direction}" for field, direction in sort_shape]
+    order_sql = f"order by {', '.join(order_parts)}" if order_parts else ""
+    count_sql = f"select count(*) from {quote_ident(physical)} {where_sql}"
+    page_sql = f"select * from {quote_ident(physical)} {where_sql} {order_sql} limit ? offset ?"
+    return count_sql, page_sql
+
+
+def _arrow_batch_to_rows(batch: pa.RecordBatch, iso_datetimes: bool = False) -> list[dict[str, Any]]:
+    # Arrow converts whole columns to Python objects in C++. A few types are first cast so the
+    # rows keep the shapes clients already get: DATE as a midnight datetime, DECIMAL/HUGEINT
+    # as float, nanosecond timestamps truncated to microseconds, and NaN as null.
+    columns: list[list[Any]] = []
+    for field, column in zip(batch.schema, batch.columns):
+        t = field.type
+        if pa.types.is_decimal(t):
+            column = column.cast(pa.float64())
+        elif pa.types.is_date(t):
+            column = column.cast(pa.timestamp("us"))
+        elif pa.types.is_timestamp(t) and t.unit == "ns":
+            column = column.cast(pa.timestamp("us", tz=t.tz), safe=False)
+        if pa.types.is_floating(column.type) and column.null_count < len(column):
+            # Most float columns hold no NaN; only rebuild the ones that do.
+            nan_mask = pc.is_nan(column)
+            if pc.any(nan_mask).as_py():
+                column = pc.if_else(nan_mask, pa.scalar(None, column.type), column)
+        values = column.to_pylist()
+        if pa.types.is_interval(column.type):
+            # MonthDayNano -> timedelta, with DuckDB's own 30-day month.
+            values = [
+                None if v is None else timedelta(days=v.months * 30 + v.days, microseconds=v.nanoseconds // 1000)
+                for v in values
+            ]
+        elif iso_datetimes and pa.types.is_timestamp(column.type):
+            # Decided per column from the schema, so other columns never see a per-cell check.
+            values = [None if v is None else v.isoformat() for v in values]
+        columns.append(values)
+    names = batch.schema.names
+    return [dict(zip(names, values)) for values in zip(*columns)]
+
+
+def _fetch_rows(
+    conn: duckdb.DuckDBPyConnection,
+    sql: str,
+    params: list[Any] | None = None,
+    iso_datetimes: bool = False,
+) -> list[dict[str, Any]]:
+    # Small result sets as row dicts, converted column-wise from Arrow like query_row_batches. The
+    # whole result is combined into one batch so each column is converted in a single pass.
+    table = conn.execute(sql, params or []).to_arrow_table().combine_chunks()
+    batches = table.to_batches()
+    return _arrow_batch_to_rows(batches[0], iso_datetimes) if batches else []
+
+
+# Rows per Arrow record batch handed out by query_row_batches.
+ROWS_BATCH_SIZE = 4096
+
+
+def query_row_batches(
   conn: duckdb.DuckDBPyConnection,
   table_id: str,
   offset: int,
   limit: int,
   filters: list[dict[str, Any]],
   sort: list[dict[str, str]],
-) -> tuple[list[dict[str, Any]], int]:
+) -> tuple[Iterator[list[dict[str, Any]]], int]:
+    # Validation and the count run eagerly; the page itself is decoded lazily, one record
+    # batch at a time, so the connection must stay checked out until the iterator is drained.
     physical = _active_physical_name(conn, table_id)
-    columns = [c[0] for c in _list_columns(conn, physical)]
-    allowed = set(columns)
+    allowed = _column_names(conn, physical)
 
-    where_parts: list[str] = []
+    filter_shape: list[tuple[str, str, int]] = []
     params: list[Any] = []
     for f in filters:
         field = f["field"]
         if field not in allowed:
             raise ValueError(f"Unknown field: {field}")
         op = f["op"]
-        if op == "isnull":
-            where_parts.append(f"{quote_ident(field)} is null")
-        elif op == "notnull":
-            where_parts.append(f"{quote_ident(field)} is not null")
+        if op in {"isnull", "notnull"}:
+            filter_shape.append((field, op, 0))
         elif op == "contains":
-            where_parts.append(f"{quote_ident(field)} ilike ?")
+            filter_shape.append((field, op, 1))
             params.append(f"%{f.get('value','')}%")
         elif op == "in":
             values = f.get("value") or []
             if not isinstance(values, list) or not values:
-                where_parts.append("false")
+                filter_shape.append((field, op, 0))
             else:
-                where_parts.append(f"{quote_ident(field)} in ({','.join(['?'] * len(values))})")
+                filter_shape.append((field, op, len(values)))
                 params.extend(values)
         elif op == "between":
             v = f.get("value") or []
             if not isinstance(v, list) or len(v) != 2:
                 raise ValueError("between requires [low, high]")
-            where_parts.append(f"{quote_ident(field)} between ? and ?")
+            filter_shape.append((field, op, 2))
             params.extend([v[0], v[1]])
         else:
-            sql_op = {
-                "eq": "=",
-                "neq": "!=",
-                "lt": "<",
-                "lte": "<=",
-                "gt": ">",
-                "gte": ">=",
-            }.get(op)
-            if not sql_op:
+            if op not in _COMPARISON_OPS:
                 raise ValueError(f"Unsupported op: {op}")
-            where_parts.append(f"{quote_ident(field)} {sql_op} ?")
+            filter_shape.append((field, op, 1))
             params.append(f.get("value"))
 
-    where_sql = f"where {' and '.join(where_parts)}" if where_parts else ""
-
-    order_parts: list[str] = []
+    sort_shape: list[tuple[str, str]] = []
     for s in sort:
         field = s["field"]
         if field not in allowed:
@@ -576,76 +1067,54 @@ def query_rows(
         direction = s.get("direction", "asc").lower()
         if direction not in {"asc", "desc"}:
             raise ValueError("direction must be asc|desc")
-        order_parts.append(f"{quote_ident(field)} {direction}")
-    order_sql = f"order by {', '.join(order_parts)}" if order_parts else ""
-
-    total = int(conn.execute(f"select count(*) from {quote_ident(physical)} {where_sql}", params).fetchone()[0])
-    df = conn.execute(
-        f"select * from {quote_ident(physical)} {where_sql} {order_sql} limit ? offset ?",
-        [*params, limit, offset],
-    ).fetchdf()
+        sort_shape.append((field, direction))
 
-    # FastAPI/Pydantic serialization can choke on pandas/numpy scalar types.
-    # Normalize to plain Python types (datetime, int/float/str/bool/None).
-    rows: list[dict[str, Any]] = df.to_dict(orient="records")
-    try:
-        import pandas as _pd  # type: ignore
-        import numpy as _np  # type: ignore
-
-        def _norm(v: Any) -> Any:
-            if v is None:
-                return None
-            # pandas missing
-            if v is _pd.NaT:
-                return None
-            # pandas Timestamp -> python datetime
-            if isinstance(v, _pd.Timestamp):
-                return v.to_pydatetime()
-            # numpy scalar -> python scalar
-            if isinstance(v, _np.generic):
-                return v.item()
-            # NaN -> None (keep consistent with null semantics)
-            if isinstance(v, float) and _pd.isna(v):
-                return None
-            return v
-
-        rows = [{k: _norm(v) for k, v in r.items()} for r in rows]
-    except Exception:
-        # Best-effort normalization; if deps missing, return raw.
-        pass
-
-    return rows, total
+    count_sql, page_sql = _rows_query_sql(physical, tuple(filter_shape), tuple(sort_shape))
+    total = int(conn.execute(count_sql, params).fetchone()[0])
+    reader = conn.execute(page_sql, [*params, limit, offset]).fetch_record_batch(ROWS_BATCH_SIZE)
+    return (_arrow_batch_to_rows(batch) for batch in reader), total
 
 
 def compute_summary(conn: duckdb.DuckDBPyConnection, table_id: str) -> dict[str, Any]:
     physical = _active_physical_name(conn, table_id)
     name = conn.execute("select name from dw_meta.tables where id = ?", [table_id]).fetchone()[0]
     cols = _list_columns(conn, physical)
+    row_count = int(conn.execute(f"select count(*) from {quote_ident(physical)}").fetchone()[0] or 0)
+    numeric_types = {"INTEGER", "INT", "INT4", "BIGINT", "INT8", "DOUBLE", "FLOAT", "FLOAT8", "REAL", "DECIMAL"}
+
+    # Every scalar statistic comes from one scan: per column the missing count, then either
+    # the eight numeric aggregates or the distinct count. Top values stay one typed GROUP BY
+    # per categorical column.
+    exprs: list[str] = []
+    for col, col_type, _ in cols:
+        qc = quote_ident(col)
+        exprs.append(f"count_if({qc} is null)")
+        if col_type.upper() in numeric_types:
+            exprs.extend(
+                [
+                    f"count({qc})",
+                    f"avg({qc})",
+                    f"stddev_samp({qc})",
+                    f"min({qc})",
+                    f"quantile_cont({qc}, 0.25)",
+                    f"median({qc})",
+                    f"quantile_cont({qc}, 0.75)",
+                    f"max({qc})",
+                ]
+            )
+        else:
+            exprs.append(_count_distinct_sql(qc, row_count))
+    stats = conn.execute(f"select {', '.join(exprs)} from {quote_ident(physical)}").fetchone() if exprs else ()
+
     numeric_stats: list[dict[str, Any]] = []
     categorical_stats: list[dict[str, Any]] = []
+    pos = 0
     for col, col_type, _ in cols:
-        duck_t = col_type.upper()
-        missing = int(
-            conn.execute(
-                f"select sum(case when {quote_ident(col)} is null then 1 else 0 end) from {quote_ident(physical)}"
-            ).fetchone()[0]
-            or 0
-        )
-        if duck_t in {"INTEGER", "INT", "INT4", "BIGINT", "INT8", "DOUBLE", "FLOAT", "FLOAT8", "REAL", "DECIMAL"}:
-            row = conn.execute(
-                f"""
-                select
-                  count({quote_ident(col)}) as count,
-                  avg({quote_ident(col)}) as mean,
-                  stddev_samp({quote_ident(col)}) as std,
-                  min({quote_ident(col)}) as min,
-                  quantile_cont({quote_ident(col)}, 0.25) as p25,
-                  median({quote_ident(col)}) as median,
-                  quantile_cont({quote_ident(col)}, 0.75) as p75,
-                  max({quote_ident(col)}) as max
-                from {quote_ident(physical)}
-                """
-            ).fetchone()
+        missing = int(stats[pos] or 0)
+        pos += 1
+        if col_type.upper() in numeric_types:
+            row = stats[pos : pos + 8]
+            pos += 8
             numeric_stats.append(
                 {
                     "field": col,
@@ -661,11 +1130,10 @@ def compute_summary(conn: duckdb.DuckDBPyConnection, table_id: str) -> dict[str,
                 }
             )
         else:
-            unique_count = int(
-                conn.execute(f"select count(distinct {quote_ident(col)}) from {quote_ident(physical)}").fetchone()[0]
-                or 0
-            )
-            top = conn.execute(
+            unique_count = int(stats[pos] or 0)
+            pos += 1
+            top_values = _fetch_rows(
+                conn,
                 f"""
                 select {quote_ident(col)} as value, count(*) as count
                 from {quote_ident(physical)}
@@ -673,13 +1141,13 @@ def compute_summary(conn: duckdb.DuckDBPyConnection, table_id: str) -> dict[str,
                 group by {quote_ident(col)}
                 order by count desc
                 limit 10
-                """
-            ).fetchdf()
+                """,
+            )
             categorical_stats.append(
                 {
                     "field": col,
                     "uniqueCount": unique_count,
-                    "topValues": top.to_dict(orient="records"),
+                    "topValues": top_values,
                     "missing": missing,
                 }
             )
@@ -696,12 +1164,26 @@ def compute_summary(conn: duckdb.DuckDBPyConnection, table_id: str) -> dict[str,
 def compute_quality(conn: duckdb.DuckDBPyConnection, table_id: str, keys: list[str] | None) -> dict[str, Any]:
     physical = _active_physical_name(conn, table_id)
     name = conn.execute("select name from dw_meta.tables where id = ?", [table_id]).fetchone()[0]
-    total_rows = int(conn.execute(f"select count(*) from {quote_ident(physical)}").fetchone()[0])
     cols = _list_columns(conn, physical)
 
-    missing_by_column: list[dict[str, Any]] = []
+    # Row count, per-column null counts and the text columns' parse probes all come out of
+    # one aggregate scan.
+    text_cols = [col for col, col_type, _ in cols if col_type.upper() in {"VARCHAR", "TEXT"}]
+    exprs = ["count(*)"]
     for col, _, _ in cols:
-        missing = _missing_count(conn, physical, col)
+        exprs.append(f"count_if({quote_ident(col)} is null)")
+    for col in text_cols:
+        qt = quote_ident(col)
+        exprs.append(f"count({qt})")
+        exprs.append(f"count_if(try_cast({qt} as double) is not null)")
+        exprs.append(f"count_if(try_cast({qt} as date) is not null)")
+    scan = conn.execute(f"select {', '.join(exprs)} from {quote_ident(physical)}").fetchone()
+    total_rows = int(scan[0])
+    null_counts = [int(v or 0) for v in scan[1 : 1 + len(cols)]]
+    text_probes = scan[1 + len(cols) :]
+
+    missing_by_column: list[dict[str, Any]] = []
+    for (col, _, _), missing in zip(cols, null_counts):
         missing_by_column.append(
             {"field": col, "count": missing, "rate": (missing / total_rows) if total_rows else 0.0}
         )
@@ -709,13 +1191,35 @@ def compute_quality(conn: duckdb.DuckDBPyConnection, table_id: str, keys: list[s
 
     key_conflicts: list[dict[str, Any]] = []
     pk_row = conn.execute("select fields_json from dw_meta.primary_keys where table_id = ?", [table_id]).fetchone()
-    pk_fields = json.loads(pk_row[0]) if pk_row else []
+    pk_fields = orjson.loads(pk_row[0]) if pk_row else []
     if pk_fields:
-        key_expr = " || '␟' || ".join([f"coalesce(cast({quote_ident(k)} as varchar),'')" for k in pk_fields])
+        # Keys compare as before (NULL and '' are the same key), but without building a
+        # concatenated string per row: a 64-bit hash screens for duplicates and the exact
+        # grouped count only runs when the hash reports some (collisions only over-report).
+        col_types = {c[0]: c[1].upper() for c in cols}
+        key_exprs = [
+            f"coalesce({quote_ident(k)}, '')" if col_types.get(k) in {"VARCHAR", "TEXT"} else quote_ident(k)
+            for k in pk_fields
+        ]
         dup = int(
-            conn.execute(f"select count(*) - count(distinct ({key_expr})) from {quote_ident(physical)}").fetchone()[0]
+            conn.execute(
+                f"select count(*) - count(distinct hash({', '.join(key_exprs)})) from {quote_ident(physical)}"
+            ).fetchone()[0]
             or 0
         )
+        if dup > 0:
+            dup = int(
+                conn.execute(
+                    f"""
+                    select coalesce(sum(c - 1), 0) from (
+                      select count(*) as c from {quote_ident(physical)}
+                      group by {', '.join(key_exprs)}
+                      having count(*) > 1
+                    )
+                    """
+                ).fetchone()[0]
+                or 0
+            )
         if dup > 0:
             key_conflicts.append({"key": pk_fields, "message": f"Primary key is not unique: {dup} duplicate rows"})
 
@@ -727,7 +1231,7 @@ def compute_quality(conn: duckdb.DuckDBPyConnection, table_id: str, keys: list[s
         key_list = ", ".join([quote_ident(k) for k in keys])
         dup_count = int(
             conn.execute(
-                f"select sum(case when c>1 then c-1 else 0 end) from (select count(*) as c from {quote_ident(physical)} group by {key_list})"
+                f"select sum(c - 1) filter (where c > 1) from (select count(*) as c from {quote_ident(physical)} group by {key_list})"
             ).fetchone()[0]
             or 0
         )
@@ -740,29 +1244,10 @@ def compute_quality(conn: duckdb.DuckDBPyConnection, table_id: str, keys: list[s
         )
 
     type_issues: list[dict[str, Any]] = []
-    for col, col_type, _ in cols:
-        if col_type.upper() not in {"VARCHAR", "TEXT"}:
-            continue
-        total_nonnull = int(
-            conn.execute(f"select count(*) from {quote_ident(physical)} where {quote_ident(col)} is not null").fetchone()[
-                0
-            ]
-            or 0
-        )
+    for i, col in enumerate(text_cols):
+        total_nonnull, numeric_ok, date_ok = (int(v or 0) for v in text_probes[3 * i : 3 * i + 3])
         if total_nonnull == 0:
             continue
-        numeric_ok = int(
-            conn.execute(
-                f"select count(*) from {quote_ident(physical)} where {quote_ident(col)} is not null and try_cast({quote_ident(col)} as double) is not null"
-            ).fetchone()[0]
-            or 0
-        )
-        date_ok = int(
-            conn.execute(
-                f"select count(*) from {quote_ident(physical)} where {quote_ident(col)} is not null and try_cast({quote_ident(col)} as date) is not null"
-            ).fetchone()[0]
-            or 0
-        )
         issues: list[str] = []
         if 0.8 <= (numeric_ok / total_nonnull) < 1.0:
             issues.append(f"Some values look numeric but fail parsing ({total_nonnull - numeric_ok} bad)")
@@ -784,76 +1269,104 @@ def compute_quality(conn: duckdb.DuckDBPyConnection, table_id: str, keys: list[s
     }
 
 
-def set_primary_key(conn: duckdb.DuckDBPyConnection, table_id: str, fields: list[str]) -> None:
-    physical = _active_physical_name(conn, table_id)
-    cols = {c[0] for c in _list_columns(conn, physical)}
-    for f in fields:
-        if f not in cols:
-            raise ValueError(f"Unknown field: {f}")
-    conn.execute(
+def set_primary_keys(conn: duckdb.DuckDBPyConnection, keys: list[tuple[str, list[str]]]) -> None:
+    # Validate every table first so a bad entry leaves no partial write, then bind all
+    # rows to one INSERT.
+    for table_id, fields in keys:
+        cols = _column_names(conn, _active_physical_name(conn, table_id))
+        for f in fields:
+            if f not in cols:
+                raise ValueError(f"Unknown field: {f}")
+    now = utcnow()
+    conn.executemany(
         "insert or replace into dw_meta.primary_keys (table_id, fields_json, created_at) values (?, ?, ?)",
-        [table_id, _json_dumps(fields), utcnow()],
+        [[table_id, _json_dumps(fields), now] for table_id, fields in keys],
     )
+    _forget_table_meta(conn, *(table_id for table_id, _fields in keys))
 
 
-def create_relation(conn: duckdb.DuckDBPyConnection, payload: dict[str, Any]) -> dict[str, Any]:
-    rid = new_id("rel")
-    conn.execute(
-        """
-        insert into dw_meta.relation_edges
-          (id, fk_table_id, fk_fields_json, pk_table_id, pk_fields_json, cardinality, created_at)
-        values (?, ?, ?, ?, ?, ?, ?)
-        """,
-        [
-            rid,
-            payload["fkTableId"],
-            _json_dumps(payload["fkFields"]),
-            payload["pkTableId"],
-            _json_dumps(payload["pkFields"]),
-            payload["cardinality"],
-            utcnow(),
-        ],
-    )
-    return {"id": rid, **payload}
+def set_primary_key(conn: duckdb.DuckDBPyConnection, table_id: str, fields: list[str]) -> None:
+    set_primary_keys(conn, [(table_id, fields)])
 
 
-def list_relations(conn: duckdb.DuckDBPyConnection) -> list[dict[str, Any]]:
-    explicit_rows = conn.execute(
-        """
-        select id, fk_table_id, fk_fields_json, pk_table_id, pk_fields_json, cardinality, created_at
-        from dw_meta.relation_edges
-        order by created_at desc
-        """
-    ).fetchall()
-    inferred_rows = conn.execute(
-        """
-        select id, fk_table_id, fk_fields_json, pk_table_id, pk_fields_json, cardinality, created_at
-        from dw_meta.relation_edges_inferred
-        order by created_at desc
-        """
-    ).fetchall()
+_INSERT_RELATION_SQL = """
+    insert into dw_meta.relation_edges
+      (id, fk_table_id, fk_fields_json, pk_table_id, pk_fields_json, cardinality, created_at)
+    values (?, ?, ?, ?, ?, ?, ?)
+"""
 
-    explicit_keys = {
-        (fk_tid, fk_json, pk_tid, pk_json)
-        for _rid, fk_tid, fk_json, pk_tid, pk_json, _card, _ts in explicit_rows
-    }
 
-    rows = [*explicit_rows, *[r for r in inferred_rows if (r[1], r[2], r[3], r[4]) not in explicit_keys]]
+def create_relations(conn: duckdb.DuckDBPyConnection, payloads: list[dict[str, Any]]) -> list[dict[str, Any]]:
     out: list[dict[str, Any]] = []
-    for rid, fk_tid, fk_json, pk_tid, pk_json, card, _ts in rows:
-        out.append(
-            {
-                "id": rid,
-                "fkTableId": fk_tid,
-                "fkFields": json.loads(fk_json),
-                "pkTableId": pk_tid,
-                "pkFields": json.loads(pk_json),
-                "cardinality": card,
-            }
+    rows: list[list[Any]] = []
+    for payload in payloads:
+        rid = new_id("rel")
+        rows.append(
+            [
+                rid,
+                payload["fkTableId"],
+                list(payload["fkFields"]),
+                payload["pkTableId"],
+                list(payload["pkFields"]),
+                payload["cardinality"],
+                # Per-row timestamps keep list_relations' created_at ordering deterministic.
+                utcnow(),
+            ]
         )
+        out.append({"id": rid, **payload})
+    if rows:
+        conn.executemany(_INSERT_RELATION_SQL, rows)
+        _forget_table_meta(conn, *(payload["fkTableId"] for payload in payloads))
     return out
 
 
+def create_relation(conn: duckdb.DuckDBPyConnection, payload: dict[str, Any]) -> dict[str, Any]:
+    return create_relations(conn, [payload])[0]
+
+
+def list_relations(conn: duckdb.DuckDBPyConnection) -> list[dict[str, Any]]:
+    # Explicit edges first, then inferred edges that no explicit edge already covers. Columns
+    # are aliased to the response keys so rows come out of Arrow ready to serve.
+    return _fetch_rows(
+        conn,
+        """
+        select id, fk_table_id as "fkTableId", fk_fields_json as "fkFields",
+          pk_table_id as "pkTableId", pk_fields_json as "pkFields", cardinality
+        from (
+          select 0 as src, id, fk_table_id, fk_fields_json, pk_table_id, pk_fields_json, cardinality, created_at
+          from dw_meta.relation_edges
+          union all
+          select 1, i.id, i.fk_table_id, i.fk_fields_json, i.pk_table_id, i.pk_fields_json, i.cardinality, i.created_at
+          from dw_meta.relation_edges_inferred i
+          anti join dw_meta.relation_edges e
+            on e.fk_table_id = i.fk_table_id
+            and e.fk_fields_json = i.fk_fields_json
+            and e.pk_table_id = i.pk_table_id
+            and e.pk_fields_json = i.pk_fields_json
+        )
+        order by src, created_at desc
+        """,
+    )
+
+
+def _duplicate_key_rows(conn: duckdb.DuckDBPyConnection, physical: str, fields: list[str]) -> int:
+    # Rows beyond the first per key, grouped on the key columns themselves (NULL and '' are
+    # distinct keys).
+    return int(
+        conn.execute(
+            f"""
+            select sum(c - 1)
+            from (
+              select count(*) as c from {quote_ident(physical)}
+              group by {', '.join(quote_ident(k) for k in fields)}
+              having count(*) > 1
+            )
+            """
+        ).fetchone()[0]
+        or 0
+    )
+
+
 def relation_report(conn: duckdb.DuckDBPyConnection, relation_id: str) -> dict[str, Any]:
     row = conn.execute(
         """
@@ -874,55 +1387,44 @@ def relation_report(conn: duckdb.DuckDBPyConnection, relation_id: str) -> dict[s
         ).fetchone()
     if not row:
         raise KeyError("Unknown relation")
-    fk_table_id, fk_fields_json, pk_table_id, pk_fields_json = row
-    fk_fields = json.loads(fk_fields_json)
-    pk_fields = json.loads(pk_fields_json)
+    fk_table_id, fk_fields, pk_table_id, pk_fields = row
     if len(fk_fields) != len(pk_fields):
         raise ValueError("FK fields and PK fields length mismatch")
 
     fk_physical = _active_physical_name(conn, fk_table_id)
     pk_physical = _active_physical_name(conn, pk_table_id)
 
-    fk_nonnull_pred = " and ".join([f"{quote_ident(f)} is not null" for f in fk_fields]) or "true"
+    fk_nonnull_pred = " and ".join([f"l.{quote_ident(f)} is not null" for f in fk_fields]) or "true"
     join_pred = " and ".join(
         [f"l.{quote_ident(fk_fields[i])} = r.{quote_ident(pk_fields[i])}" for i in range(len(fk_fields))]
     )
 
-    coverage_row = conn.execute(
-        f"""
-        select
-          sum(case when r.__in_right = 1 then 1 else 0 end) as matched,
-          count(*) as total
-        from (select *, 1 as __in_left from {quote_ident(fk_physical)} where {fk_nonnull_pred}) l
-        left join (select *, 1 as __in_right from {quote_ident(pk_physical)}) r
-          on {join_pred}
-        """
-    ).fetchone()
-    matched = int(coverage_row[0] or 0)
-    total = int(coverage_row[1] or 0)
-    coverage = (matched / total) if total else 0.0
+    fk_dup_rows = _duplicate_key_rows(conn, fk_physical, fk_fields)
+    pk_dup_rows = _duplicate_key_rows(conn, pk_physical, pk_fields)
 
-    fk_missing = int(
-        conn.execute(
-            f"select sum(case when not ({fk_nonnull_pred}) then 1 else 0 end) from {quote_ident(fk_physical)}"
-        ).fetchone()[0]
-        or 0
-    )
-
-    fk_key_expr = " || '␟' || ".join([f"coalesce(cast({quote_ident(k)} as varchar),'')" for k in fk_fields])
-    fk_dup_rows = int(
-        conn.execute(
-            f"select sum(case when c>1 then c-1 else 0 end) from (select count(*) as c from {quote_ident(fk_physical)} group by ({fk_key_expr}))"
-        ).fetchone()[0]
-        or 0
-    )
-    pk_key_expr = " || '␟' || ".join([f"coalesce(cast({quote_ident(k)} as varchar),'')" for k in pk_fields])
-    pk_dup_rows = int(
-        conn.execute(
-            f"select sum(case when c>1 then c-1 else 0 end) from (select count(*) as c from {quote_ident(pk_physical)} group by ({pk_key_expr}))"
-        ).fetchone()[0]
-        or 0
+    # One pass over the FK side; rows with a NULL key part never match and are counted as
+    # missing. With unique PK keys each FK row matches at most once, so an EXISTS probe (which
+    # stops at the first hit and emits nothing) counts the same rows the left join would.
+    # Duplicated PK keys fan rows out, and the left join keeps counting that fan-out.
+    if pk_dup_rows == 0:
+        matched_sql = f"count(*) filter (where exists (select 1 from {quote_ident(pk_physical)} r where {join_pred}))"
+        from_sql = f"{quote_ident(fk_physical)} l"
+    else:
+        matched_sql = "count(r.rowid)"
+        from_sql = f"{quote_ident(fk_physical)} l left join {quote_ident(pk_physical)} r on {join_pred}"
+    matched, total, fk_missing = (
+        int(v or 0)
+        for v in conn.execute(
+            f"""
+            select
+              {matched_sql},
+              count(*) filter (where {fk_nonnull_pred}),
+              count(*) filter (where not ({fk_nonnull_pred}))
+            from {from_sql}
+            """
+        ).fetchone()
     )
+    coverage = (matched / total) if total else 0.0
 
     return {
         "relationId": relation_id,
@@ -942,12 +1444,14 @@ def _next_version(conn: duckdb.DuckDBPyConnection, table_id: str) -> int:
 
 
 def _set_active_version(conn: duckdb.DuckDBPyConnection, table_id: str, new_version_id: str) -> None:
-    conn.execute("update dw_meta.table_versions set is_active = false where table_id = ?", [table_id])
-    conn.execute(
-        "update dw_meta.table_versions set is_active = true where id = ? and table_id = ?",
+    switched = conn.execute(
+        "update dw_meta.table_versions set is_active = (id = ?) where table_id = ? returning physical_name",
         [new_version_id, table_id],
-    )
+    ).fetchall()
+    for (physical,) in switched:
+        _forget_columns(physical)
     conn.execute("update dw_meta.tables set updated_at = ? where id = ?", [utcnow(), table_id])
+    _forget_table_meta(conn, table_id)
 
 
 def clean_drop_missing(conn: duckdb.DuckDBPyConnection, table_id: str, fields: list[str]) -> dict[str, Any]:
@@ -964,7 +1468,7 @@ def clean_table(
     physical = _active_physical_name(conn, table_id)
     cols = _list_columns(conn, physical)
     col_names = [c[0] for c in cols]
-    allowed = set(col_names)
+    allowed = _column_names(conn, physical)
     for f in fields:
         if f not in allowed:
             raise ValueError(f"Unknown field: {f}")
@@ -977,7 +1481,7 @@ def clean_table(
     where_parts: list[str] = []
     where_params: list[Any] = []
     if filters:
-        # Reuse the same filter semantics as query_rows
+        # Reuse the same filter semantics as query_row_batches
         for f in filters:
             field = f["field"]
             if field not in allowed:
@@ -1023,9 +1527,7 @@ def clean_table(
                 expr = f"lower(cast({quote_ident(c)} as varchar))"
                 select_exprs[i] = f"case when {scope_sql} then {expr} else {quote_ident(c)} end as {quote_ident(c)}"
             elif action == "standardize-missing":
-                tok = "lower(trim(cast({col} as varchar)))".format(col=quote_ident(c))
-                cond = f"{quote_ident(c)} is not null and ({tok} = '' or {tok} in ('na','n/a','null','none','nan','-','—','--','?','9999'))"
-                expr = f"case when {cond} then null else {quote_ident(c)} end"
+                expr = f"case when {_missing_token_cond(c)} then null else {quote_ident(c)} end"
                 select_exprs[i] = f"case when {scope_sql} then {expr} else {quote_ident(c)} end as {quote_ident(c)}"
             elif action in {"fill-mean", "fill-median"}:
                 # MVP: scoped fill not supported yet.
@@ -1034,54 +1536,50 @@ def clean_table(
                 duck_t = next(t for (n, t, _) in cols if n == c).upper()
                 if duck_t not in {"INTEGER", "INT", "INT4", "BIGINT", "INT8", "DOUBLE", "FLOAT", "FLOAT8", "REAL", "DECIMAL"}:
                     raise ValueError(f"{action} only supports numeric columns: {c}")
-                agg = "avg" if action == "fill-mean" else "median"
-                fill_value = conn.execute(
-                    f"select {agg}({quote_ident(c)}) from {quote_ident(physical)}"
-                ).fetchone()[0]
-                select_exprs[i] = f"coalesce({quote_ident(c)}, ?) as {quote_ident(c)}"
             else:
                 raise ValueError(f"Unsupported clean action: {action}")
 
     params: list[Any] = []
     if action in {"fill-mean", "fill-median"}:
-        # If multiple fields are selected, fill each with its own computed value.
-        select_exprs = []
-        for c in col_names:
-            if c not in fields:
-                select_exprs.append(quote_ident(c))
-                continue
-            duck_t = next(t for (n, t, _) in cols if n == c).upper()
-            if duck_t not in {"INTEGER", "INT", "INT4", "BIGINT", "INT8", "DOUBLE", "FLOAT", "FLOAT8", "REAL", "DECIMAL"}:
-                raise ValueError(f"{action} only supports numeric columns: {c}")
-            agg = "avg" if action == "fill-mean" else "median"
-            fill_value = conn.execute(f"select {agg}({quote_ident(c)}) from {quote_ident(physical)}").fetchone()[0]
-            params.append(fill_value)
-            select_exprs.append(f"coalesce({quote_ident(c)}, ?) as {quote_ident(c)}")
+        # If multiple fields are selected, fill each with its own computed value; the columns
+        # were type-checked above, and all fill values come from one scan.
+        agg = "avg" if action == "fill-mean" else "median"
+        fill_cols = [c for c in col_names if c in fields]
+        if fill_cols:
+            params = list(
+                conn.execute(
+                    f"select {', '.join(f'{agg}({quote_ident(c)})' for c in fill_cols)} from {quote_ident(physical)}"
+                ).fetchone()
+            )
+        select_exprs = [
+            f"coalesce({quote_ident(c)}, ?) as {quote_ident(c)}" if c in fields else quote_ident(c) for c in col_names
+        ]
 
+    _forget_columns(new_physical)
     conn.execute(
         f"create table {quote_ident(new_physical)} as select {', '.join(select_exprs)} from {quote_ident(physical)} {where_sql}",
         [*where_params, *params],
     )
 
-    prev_version_row = conn.execute(
-        "select id from dw_meta.table_versions where table_id = ? and is_active = true", [table_id]
-    ).fetchone()
-    prev_version_id = prev_version_row[0]
-
+    # Metadata writes use RETURNING so each statement also yields what the next one needs:
+    # deactivating the current version gives its id, marking the table dirty gives its name.
     new_version_id = new_id("ver")
+    op_id = new_id("op")
     now = utcnow()
+    prev_version_id = conn.execute(
+        "update dw_meta.table_versions set is_active = false where table_id = ? and is_active = true returning id",
+        [table_id],
+    ).fetchone()[0]
     conn.execute(
         """
         insert into dw_meta.table_versions (id, table_id, version, physical_name, op_log_id, created_at, is_active)
-        values (?, ?, ?, ?, null, ?, false)
+        values (?, ?, ?, ?, ?, ?, true)
         """,
-        [new_version_id, table_id, new_ver, new_physical, now],
+        [new_version_id, table_id, new_ver, new_physical, op_id, now],
     )
-    _set_active_version(conn, table_id, new_version_id)
-    conn.execute("update dw_meta.tables set dirty = true where id = ?", [table_id])
-
-    op_id = new_id("op")
-    table_name = conn.execute("select name from dw_meta.tables where id = ?", [table_id]).fetchone()[0]
+    table_name = conn.execute(
+        "update dw_meta.tables set dirty = true, updated_at = ? where id = ? returning name", [now, table_id]
+    ).fetchone()[0]
     conn.execute(
         """
         insert into dw_meta.operation_logs
@@ -1099,7 +1597,7 @@ def clean_table(
             new_version_id,
         ],
     )
-    conn.execute("update dw_meta.table_versions set op_log_id = ? where id = ?", [op_id, new_version_id])
+    _forget_table_meta(conn, table_id)
     return {"operationId": op_id, "tableId": table_id, "timestamp": now}
 
 
@@ -1124,20 +1622,14 @@ def undo_last_clean(conn: duckdb.DuckDBPyConnection) -> dict[str, Any] | None:
 
 
 def list_lineages(conn: duckdb.DuckDBPyConnection) -> list[dict[str, Any]]:
-    rows = conn.execute(
-        "select id, derived_table_id, source_table_ids_json, operation from dw_meta.lineage_edges order by created_at desc"
-    ).fetchall()
-    out: list[dict[str, Any]] = []
-    for lid, derived, sources_json, op in rows:
-        out.append(
-            {
-                "id": lid,
-                "derivedTableId": derived,
-                "sourceTableIds": json.loads(sources_json),
-                "operation": op,
-            }
-        )
-    return out
+    return _fetch_rows(
+        conn,
+        """
+        select id, derived_table_id as "derivedTableId", source_table_ids_json as "sourceTableIds", operation
+        from dw_meta.lineage_edges
+        order by created_at desc
+        """,
+    )
 
 
 def compute_chart(conn: duckdb.DuckDBPyConnection, table_id: str, payload: dict[str, Any]) -> dict[str, Any]:
@@ -1154,44 +1646,49 @@ def compute_chart(conn: duckdb.DuckDBPyConnection, table_id: str, payload: dict[
             **spec,
         }
 
-    cols = {c[0] for c in _list_columns(conn, physical)}
+    cols = _column_names(conn, physical)
     if field not in cols:
         raise ValueError("Unknown field")
 
     ts = utcnow()
     if kind == "histogram":
-        stats = conn.execute(
-            f"select min({quote_ident(field)}), max({quote_ident(field)}) from {quote_ident(physical)} where {quote_ident(field)} is not null"
-        ).fetchone()
-        if stats[0] is None or stats[1] is None:
+        duck_type = next(t for name, t, _ in _list_columns(conn, physical) if name == field)
+        if not _is_numeric_type(duck_type):
+            raise ValueError(f"Histogram requires a numeric field: {field}")
+        qf = quote_ident(field)
+        # NaN sorts above every float, so it would become the max and poison the bucket width.
+        valid = f"{qf} is not null" + (f" and not isnan({qf})" if duck_type in ("FLOAT", "DOUBLE") else "")
+        # Range and buckets in one statement: each row carries (min, max, valid count) and
+        # one bucket; a single-valued or empty column yields just the range row.
+        bucket_rows = conn.execute(
+            f"""
+            with s as (
+              select min({qf})::double as lo, max({qf})::double as hi, count(*) as n
+              from {quote_ident(physical)}
+              where {valid}
+            )
+            select s.lo, s.hi, s.n, g.b, g.count
+            from s
+            left join (
+              select floor( ({qf} - s.lo) / ((s.hi - s.lo) / ?) )::int as b, count(*) as count
+              from {quote_ident(physical)}, s
+              where {valid} and s.hi > s.lo
+              group by b
+            ) g on true
+            order by g.b asc
+            """,
+            [bins],
+        ).fetchall()
+        min_v, max_v, non_null = bucket_rows[0][:3]
+        if min_v is None or max_v is None:
             return {"kind": kind, "field": field, "data": {"bins": []}, "timestamp": ts}
-        min_v, max_v = float(stats[0]), float(stats[1])
         if min_v == max_v:
-            count = int(
-                conn.execute(
-                    f"select count(*) from {quote_ident(physical)} where {quote_ident(field)} is not null"
-                ).fetchone()[0]
-            )
-            return {"kind": kind, "field": field, "data": {"bins": [{"x0": min_v, "x1": max_v, "count": count}]}, "timestamp": ts}
+            return {"kind": kind, "field": field, "data": {"bins": [{"x0": min_v, "x1": max_v, "count": non_null}]}, "timestamp": ts}
         width = (max_v - min_v) / bins
-        df = conn.execute(
-            f"""
-            select
-              floor( ({quote_ident(field)} - ?) / ? )::int as b,
-              count(*) as count
-            from {quote_ident(physical)}
-            where {quote_ident(field)} is not null
-            group by b
-            order by b asc
-            """,
-            [min_v, width],
-        ).fetchdf()
         out_bins: list[dict[str, Any]] = []
-        for _, r in df.iterrows():
-            b = int(r["b"])
+        for _lo, _hi, _n, b, count in bucket_rows:
             x0 = min_v + (b * width)
-            x1 = x0 + width
-            out_bins.append({"x0": x0, "x1": x1, "count": int(r["count"])})
+            out_bins.append({"x0": x0, "x1": x0 + width, "count": count})
         return {
             "kind": kind,
             "field": field,
@@ -1212,7 +1709,8 @@ def compute_chart(conn: duckdb.DuckDBPyConnection, table_id: str, payload: dict[
         }
 
     if kind == "bar":
-        df = conn.execute(
+        values = _fetch_rows(
+            conn,
             f"""
             select {quote_ident(field)} as value, count(*) as count
             from {quote_ident(physical)}
@@ -1222,8 +1720,7 @@ def compute_chart(conn: duckdb.DuckDBPyConnection, table_id: str, payload: dict[
             limit ?
             """,
             [limit],
-        ).fetchdf()
-        values = df.to_dict(orient="records")
+        )
         return {
             "kind": kind,
             "field": field,
@@ -1247,26 +1744,27 @@ def compute_chart(conn: duckdb.DuckDBPyConnection, table_id: str, payload: dict[
         if value_field:
             if value_field not in cols:
                 raise ValueError("Unknown valueField")
-            df = conn.execute(
+            points = _fetch_rows(
+                conn,
                 f"""
                 select {quote_ident(field)} as x, avg({quote_ident(value_field)}) as y
                 from {quote_ident(physical)}
                 where {quote_ident(field)} is not null and {quote_ident(value_field)} is not null
                 group by x
                 order by x asc
-                """
-            ).fetchdf()
+                """,
+            )
         else:
-            df = conn.execute(
+            points = _fetch_rows(
+                conn,
                 f"""
                 select {quote_ident(field)} as x, count(*) as y
                 from {quote_ident(physical)}
                 where {quote_ident(field)} is not null
                 group by x
                 order by x asc
-                """
-            ).fetchdf()
-        points = df.to_dict(orient="records")
+                """,
+            )
         y_title = f"avg({value_field})" if value_field else "count"
         return {
             "kind": kind,
@@ -1319,6 +1817,7 @@ def merge_tables(conn: duckdb.DuckDBPyConnection, payload: dict[str, Any]) -> tu
     result_table_id = new_id("table")
     result_name = payload.get("resultName") or f"merge_{left_id[:8]}_{right_id[:8]}"
     result_physical = _physical_name(result_table_id, 1)
+    _forget_columns(result_physical)
 
     left_select = [f"l.{quote_ident(c)} as {quote_ident(c)}" for c in left_cols]
     right_renamed: list[str] = []
@@ -1326,19 +1825,19 @@ def merge_tables(conn: duckdb.DuckDBPyConnection, payload: dict[str, Any]) -> tu
         out_name = c if c not in left_cols else f"right_{c}"
         right_renamed.append(f"r.{quote_ident(c)} as {quote_ident(out_name)}")
 
+    # A side's rowid is null exactly when that side had no match, even for NULL keys.
     conn.execute(
         f"""
         create table {quote_ident(result_physical)} as
         select
           {", ".join(left_select + right_renamed)},
           case
-            when l.__in_left = 1 and r.__in_right = 1 then 3
-            when l.__in_left = 1 and r.__in_right is null then 1
-            when l.__in_left is null and r.__in_right = 1 then 2
-            else null
+            when l.rowid is not null and r.rowid is not null then 3
+            when l.rowid is not null then 1
+            else 2
           end as _merge
-        from (select *, 1 as __in_left from {quote_ident(left_physical)}) l
-        {join_sql} join (select *, 1 as __in_right from {quote_ident(right_physical)}) r
+        from {quote_ident(left_physical)} l
+        {join_sql} join {quote_ident(right_physical)} r
           on {join_pred}
         """
     )
@@ -1375,15 +1874,24 @@ def merge_tables(conn: duckdb.DuckDBPyConnection, payload: dict[str, Any]) -> tu
         insert into dw_meta.lineage_edges (id, derived_table_id, source_table_ids_json, operation, created_at)
         values (?, ?, ?, 'merge', ?)
         """,
-        [lineage_id, result_table_id, _json_dumps([left_id, right_id]), now],
+        [lineage_id, result_table_id, [left_id, right_id], now],
     )
 
-    rows_before_left = int(conn.execute(f"select count(*) from {quote_ident(left_physical)}").fetchone()[0])
-    rows_before_right = int(conn.execute(f"select count(*) from {quote_ident(right_physical)}").fetchone()[0])
-    rows_after = int(conn.execute(f"select count(*) from {quote_ident(result_physical)}").fetchone()[0])
-    matched = int(conn.execute(f"select count(*) from {quote_ident(result_physical)} where _merge = 3").fetchone()[0])
-    unmatched_left = int(conn.execute(f"select count(*) from {quote_ident(result_physical)} where _merge = 1").fetchone()[0])
-    unmatched_right = int(conn.execute(f"select count(*) from {quote_ident(result_physical)} where _merge = 2").fetchone()[0])
+    rows_before_left, rows_before_right, rows_after, matched, unmatched_left, unmatched_right = (
+        int(v)
+        for v in conn.execute(
+            f"""
+            select
+              (select count(*) from {quote_ident(left_physical)}),
+              (select count(*) from {quote_ident(right_physical)}),
+              count(*),
+              count(*) filter (where _merge = 3),
+              count(*) filter (where _merge = 1),
+              count(*) filter (where _merge = 2)
+            from {quote_ident(result_physical)}
+            """
+        ).fetchone()
+    )
 
     report_id = new_id("merge")
     merge_report = {
@@ -1412,30 +1920,93 @@ def reshape_table(conn: duckdb.DuckDBPyConnection, payload: dict[str, Any]) -> t
     result_table_id = new_id("table")
     result_name = payload.get("resultName") or f"reshape_{table_id[:8]}"
     result_physical = _physical_name(result_table_id, 1)
+    _forget_columns(result_physical)
 
     source_physical = _active_physical_name(conn, table_id)
-    df = conn.execute(f"select * from {quote_ident(source_physical)}").arrow()
-    pl_df = pl.from_arrow(df)
-    rows_before, cols_before = pl_df.height, pl_df.width
-
+    source_columns = _list_columns(conn, source_physical)
+    source_cols = [c[0] for c in source_columns]
+    rows_before = int(conn.execute(f"select count(*) from {quote_ident(source_physical)}").fetchone()[0])
+    cols_before = len(source_cols)
+    id_list = ", ".join(quote_ident(c) for c in id_vars)
+
+    # Reshaping runs inside DuckDB; the explicit orderings keep the row and column order of
+    # the former polars melt/pivot.
     if direction == "wide-to-long":
         variable_name = payload.get("variableName") or "variable"
         value_name = payload.get("valueName") or "value"
-        out = pl_df.melt(
-            id_vars=id_vars, value_vars=value_vars, variable_name=variable_name, value_name=value_name
-        )
+        # valueVars is melted as given; an empty list melts nothing (zero rows), like melt did.
+        melt_vars = list(value_vars)
+        if not melt_vars:
+            conn.execute(
+                f"""
+                create table {quote_ident(result_physical)} as
+                select {id_list + ', ' if id_vars else ''}null::varchar as {quote_ident(variable_name)},
+                  null::varchar as {quote_ident(value_name)}
+                from {quote_ident(source_physical)}
+                limit 0
+                """
+            )
+        else:
+            # UNPIVOT needs one value type. DuckDB promotes numeric columns itself; any other
+            # mix (text with numbers, booleans, dates, ...) is melted as text.
+            types = {c[0]: c[1] for c in source_columns}
+            melt_types = {types[v] for v in melt_vars}
+            as_text = len(melt_types) > 1 and not all(_is_numeric_type(t) for t in melt_types)
+            melt_cols = ", ".join(
+                f"cast({quote_ident(v)} as varchar) as {quote_ident(v)}" if as_text else quote_ident(v) for v in melt_vars
+            )
+            # melt is column-major: every row for the first value column, then the next one.
+            conn.execute(
+                f"""
+                create table {quote_ident(result_physical)} as
+                select {id_list + ', ' if id_vars else ''}{quote_ident(variable_name)}, {quote_ident(value_name)}
+                from (
+                  select {id_list + ', ' if id_vars else ''}{melt_cols}, rowid as __rn
+                  from {quote_ident(source_physical)}
+                )
+                unpivot include nulls (
+                  {quote_ident(value_name)} for {quote_ident(variable_name)} in ({', '.join(quote_ident(v) for v in melt_vars)})
+                )
+                order by list_position(?, {quote_ident(variable_name)}), __rn
+                """,
+                [melt_vars],
+            )
     else:
         pivot_columns = payload.get("pivotColumns")
         pivot_values = payload.get("pivotValues")
         if not pivot_columns or not pivot_values:
             raise ValueError("long-to-wide requires pivotColumns and pivotValues")
-        out = pl_df.pivot(index=id_vars, columns=pivot_columns, values=pivot_values, aggregate_function="first")
-
-    rows_after, cols_after = out.height, out.width
+        # One output column per pivot value in order of first appearance, one row per index
+        # key in order of first appearance, holding the first value seen.
+        keys = [
+            r[0]
+            for r in conn.execute(
+                f"""
+                select cast({quote_ident(pivot_columns)} as varchar) as k
+                from {quote_ident(source_physical)}
+                group by k
+                order by min(rowid)
+                """
+            ).fetchall()
+        ]
+        key_exprs = [
+            f"first({quote_ident(pivot_values)} order by rowid) filter "
+            f"(where cast({quote_ident(pivot_columns)} as varchar) is not distinct from ?) as {quote_ident('null' if k is None else k)}"
+            for k in keys
+        ]
+        conn.execute(
+            f"""
+            create table {quote_ident(result_physical)} as
+            select {', '.join([*(quote_ident(c) for c in id_vars), *key_exprs])}
+            from {quote_ident(source_physical)}
+            group by all
+            order by min(rowid)
+            """,
+            keys,
+        )
 
-    conn.register("tmp_reshape_arrow", out.to_arrow())
-    conn.execute(f"create table {quote_ident(result_physical)} as select * from tmp_reshape_arrow")
-    conn.unregister("tmp_reshape_arrow")
+    rows_after = int(conn.execute(f"select count(*) from {quote_ident(result_physical)}").fetchone()[0])
+    cols_after = len(_list_columns(conn, result_physical))
 
     now = utcnow()
     conn.execute(
@@ -1464,7 +2035,7 @@ def reshape_table(conn: duckdb.DuckDBPyConnection, payload: dict[str, Any]) -> t
         insert into dw_meta.lineage_edges (id, derived_table_id, source_table_ids_json, operation, created_at)
         values (?, ?, ?, 'reshape', ?)
         """,
-        [lineage_id, result_table_id, _json_dumps([table_id]), now],
+        [lineage_id, result_table_id, [table_id], now],
     )
 
     report_id = new_id("reshape")
@@ -1486,10 +2057,21 @@ def reshape_table(conn: duckdb.DuckDBPyConnection, payload: dict[str, Any]) -> t
 
 
 def export_table_csv(conn: duckdb.DuckDBPyConnection, table_id: str, out_path: Path) -> None:
+    physical = _active_physical_name(conn, table_id)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    # DuckDB's CSV writer already formats chunks on all threads while keeping row order;
+    # there is no separate "parallel" switch for writing.
+    conn.execute(
+        f"copy (select * from {quote_ident(physical)}) to ? (format csv, header, delimiter ',')",
+        [str(out_path)],
+    )
+
+
+def export_table_parquet(conn: duckdb.DuckDBPyConnection, table_id: str, out_path: Path) -> None:
     physical = _active_physical_name(conn, table_id)
     out_path.parent.mkdir(parents=True, exist_ok=True)
     conn.execute(
-        f"copy (select * from {quote_ident(physical)}) to ? (header, delimiter ',')",
+        f"copy (select * from {quote_ident(physical)}) to ? (format parquet, compression zstd)",
         [str(out_path)],
     )
 
@@ -1500,10 +2082,10 @@ def export_table_dta(conn: duckdb.DuckDBPyConnection, table_id: str, out_path: P
     df = conn.execute(f"select * from {quote_ident(physical)}").fetchdf()
 
     original = list(df.columns)
-    cleaned = [sanitize_stata_varname(c) for c in original]
-    cleaned = dedupe_names(cleaned)
-    mapping = {original[i]: cleaned[i] for i in range(len(original))}
-    df = df.rename(columns=mapping)
+    cleaned = dedupe_names(sanitize_stata_varname(c) for c in original)
+    mapping = dict(zip(original, cleaned))
+    # Relabel in place; rename() would build a second frame over the same data.
+    df.columns = cleaned
 
     pyreadstat.write_dta(df, str(out_path))
     return mapping
@@ -1526,7 +2108,7 @@ def get_history(conn: duckdb.DuckDBPyConnection) -> list[dict[str, Any]]:
                 "type": typ,
                 "tableId": table_id,
                 "tableName": table_name,
-                "params": json.loads(params_json),
+                "params": orjson.loads(params_json),
                 "timestamp": created_at,
                 "undoable": bool(undoable),
             }
@@ -1534,6 +2116,75 @@ def get_history(conn: duckdb.DuckDBPyConnection) -> list[dict[str, Any]]:
     return out
 
 
+def _preview_text_sql(field: str, duck_type: str) -> str:
+    # VARCHAR columns are used as-is; only other types need the cast.
+    ident = quote_ident(field)
+    return ident if duck_type.upper() == "VARCHAR" else f"cast({ident} as varchar)"
+
+
+def _preview_cond_sql(action: str, field: str, duck_type: str) -> str:
+    if action == "standardize-missing":
+        return _missing_token_cond(field)
+    # A NULL comparison is never true, so NULL cells need no separate check.
+    text = _preview_text_sql(field, duck_type)
+    if action == "trim":
+        return f"{text} != trim({text})"
+    if action == "lowercase":
+        return f"{text} != lower({text})"
+    return "false"
+
+
+def _preview_after_sql(action: str, field: str, duck_type: str) -> str:
+    # The value the clean action leaves behind, as clean_table computes it.
+    if action == "standardize-missing":
+        return f"case when {_missing_token_cond(field)} then null else {quote_ident(field)} end"
+    if action == "trim":
+        return f"trim({_preview_text_sql(field, duck_type)})"
+    return f"lower({_preview_text_sql(field, duck_type)})"
+
+
+_PREVIEW_SCOPE_SQL = {
+    "isnull": "{qt} is null",
+    "notnull": "{qt} is not null",
+    "contains": "{qt} ilike ?",
+    "eq": "{qt} = ?",
+    "neq": "{qt} != ?",
+}
+
+
+@lru_cache(maxsize=256)
+def _preview_sql(
+    physical: str,
+    action: str,
+    field_types: tuple[tuple[str, str], ...],
+    scope_shape: tuple[tuple[str, str], ...],
+) -> str:
+    # SQL text depends only on the (table, action, fields, scope-shape) plan key; values are
+    # bound per call. Per-field affected cells, affected rows (any selected field) and the
+    # sample rows come back from one statement: the single count row is left-joined onto the
+    # sample, so it is still returned when nothing matches.
+    scope_parts = [_PREVIEW_SCOPE_SQL[op].format(qt=quote_ident(field)) for field, op in scope_shape]
+    scope_sql = f"({' and '.join(scope_parts)})" if scope_parts else "true"
+    # Each field's predicate is built once and shared by its count and the any-field filter.
+    conds = [_preview_cond_sql(action, f, t) for f, t in field_types]
+    any_cond = " or ".join(f"({cond})" for cond in conds)
+    count_cols = ", ".join(f"count_if({cond}) as __n{i}" for i, cond in enumerate(conds))
+    # Each field comes back as a (before, after) column pair.
+    pair_cols = ", ".join(
+        f"{quote_ident(f)} as __b{i}, {_preview_after_sql(action, f, t)} as __a{i}"
+        for i, (f, t) in enumerate(field_types)
+    )
+    # rowid comes straight from the scan (no window operator); +1 keeps the 1-based ids the
+    # preview has always reported.
+    return f"""
+        with scoped as (select rowid + 1 as __rid, * from {quote_ident(physical)} where {scope_sql}),
+        counts as (select {count_cols}, count_if({any_cond}) as __rows from scoped),
+        sample as (select __rid, {pair_cols} from scoped where {any_cond} limit ?)
+        select * from counts left join sample on true
+        order by sample.__rid
+        """
+
+
 def preview_clean(
     conn: duckdb.DuckDBPyConnection,
     table_id: str,
@@ -1556,117 +2207,44 @@ def preview_clean(
     if action not in {"standardize-missing", "trim", "lowercase"}:
         raise ValueError("Preview not supported for this action yet")
 
-    # Use row_number as a stable-ish synthetic row id for preview purposes.
-    base_query = f"select row_number() over () as __rid, * from {quote_ident(physical)}"
-
     # Optional scope filters
     filters = filters or []
-    scope_parts: list[str] = []
+    scope_shape: list[tuple[str, str]] = []
     scope_params: list[Any] = []
-    if filters:
-        for f in filters:
-            field = f["field"]
-            if field not in allowed:
-                raise ValueError(f"Unknown field: {field}")
-            op = f["op"]
-            if op == "isnull":
-                scope_parts.append(f"{quote_ident(field)} is null")
-            elif op == "notnull":
-                scope_parts.append(f"{quote_ident(field)} is not null")
-            elif op == "contains":
-                scope_parts.append(f"{quote_ident(field)} ilike ?")
-                scope_params.append(f"%{f.get('value','')}%")
-            elif op == "eq":
-                scope_parts.append(f"{quote_ident(field)} = ?")
-                scope_params.append(f.get("value"))
-            elif op == "neq":
-                scope_parts.append(f"{quote_ident(field)} != ?")
-                scope_params.append(f.get("value"))
-            else:
-                raise ValueError(f"Unsupported filter op for preview: {op}")
-
-    scope_sql = f"({' and '.join(scope_parts)})" if scope_parts else "true"
+    for f in filters:
+        field = f["field"]
+        if field not in allowed:
+            raise ValueError(f"Unknown field: {field}")
+        op = f["op"]
+        if op not in _PREVIEW_SCOPE_SQL:
+            raise ValueError(f"Unsupported filter op for preview: {op}")
+        scope_shape.append((field, op))
+        if op == "contains":
+            scope_params.append(f"%{f.get('value','')}%")
+        elif op in {"eq", "neq"}:
+            scope_params.append(f.get("value"))
 
-    def _cond_sql(field: str) -> str:
-        ident = quote_ident(field)
-        if action == "standardize-missing":
-            tok = f"lower(trim(cast({ident} as varchar)))"
-            return f"{ident} is not null and ({tok} = '' or {tok} in ('na','n/a','null','none','nan','-','—','--','?','9999'))"
-        if action == "trim":
-            tok = f"trim(cast({ident} as varchar))"
-            return f"{ident} is not null and cast({ident} as varchar) != {tok}"
-        if action == "lowercase":
-            tok = f"lower(cast({ident} as varchar))"
-            return f"{ident} is not null and cast({ident} as varchar) != {tok}"
-        return "false"
-
-    # per-field affected cell count
     per_field: list[dict[str, Any]] = []
+    samples: list[dict[str, Any]] = []
     total_cells = 0
-    for f in fields:
-        cond = _cond_sql(f)
-        cnt = int(conn.execute(f"select count(*) from ({base_query}) t where {scope_sql} and {cond}", scope_params).fetchone()[0] or 0)
-        total_cells += cnt
-        per_field.append({"field": f, "affectedCells": cnt})
-
-    # affected rows (any selected field)
+    affected_rows = 0
     if fields:
-        any_cond = " or ".join([f"({_cond_sql(f)})" for f in fields])
-        affected_rows = int(conn.execute(f"select count(*) from ({base_query}) t where {scope_sql} and ({any_cond})", scope_params).fetchone()[0] or 0)
-    else:
-        affected_rows = 0
-
-    # sample rows
-    samples: list[dict[str, Any]] = []
-    if fields and limit > 0 and affected_rows > 0:
-        any_cond = " or ".join([f"({_cond_sql(f)})" for f in fields])
-        df = conn.execute(
-            f"select * from ({base_query}) t where {scope_sql} and ({any_cond}) limit ?",
-            [*scope_params, int(limit)],
-        ).fetchdf()
-        raw = df.to_dict(orient="records")
-        # Normalize pandas/numpy types (reuse helper logic)
-        try:
-            import pandas as _pd  # type: ignore
-            import numpy as _np  # type: ignore
-
-            def _norm(v: Any) -> Any:
-                if v is None:
-                    return None
-                if v is _pd.NaT:
-                    return None
-                if isinstance(v, _pd.Timestamp):
-                    return v.to_pydatetime().isoformat()
-                if isinstance(v, _np.generic):
-                    vv = v.item()
-                    if isinstance(vv, float) and _pd.isna(vv):
-                        return None
-                    return vv
-                if isinstance(v, float) and _pd.isna(v):
-                    return None
-                return v
-
-            raw = [{k: _norm(v) for k, v in r.items()} for r in raw]
-        except Exception:
-            pass
+        col_types = {c[0]: c[1] for c in cols}
+        sql = _preview_sql(physical, action, tuple((f, col_types[f]) for f in fields), tuple(scope_shape))
+        raw = _fetch_rows(conn, sql, [*scope_params, max(int(limit), 0)], iso_datetimes=True)
+        head = raw[0]
+        for i, f in enumerate(fields):
+            cnt = int(head[f"__n{i}"] or 0)
+            total_cells += cnt
+            per_field.append({"field": f, "affectedCells": cnt})
+        affected_rows = int(head["__rows"] or 0)
 
         for r in raw:
-            item = {"__rid": r.get("__rid")}
-            for f in fields:
-                before = r.get(f)
-                if before is None:
-                    after = None
-                else:
-                    if action == "standardize-missing":
-                        s = str(before).strip().lower()
-                        after = None if (s == "" or s in {"na","n/a","null","none","nan","-","—","--","?","9999"}) else before
-                    elif action == "trim":
-                        after = str(before).strip()
-                    elif action == "lowercase":
-                        after = str(before).lower()
-                    else:
-                        after = before
-                item[f] = {"before": before, "after": after}
+            if r["__rid"] is None:
+                continue
+            item: dict[str, Any] = {"__rid": r["__rid"]}
+            for i, f in enumerate(fields):
+                item[f] = {"before": r[f"__b{i}"], "after": r[f"__a{i}"]}
             samples.append(item)
 
     return {
@@ -2,19 +2,34 @@ from __future__ import annotations
 
 import os
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Settings:
     data_dir: Path
-    allowed_origins: list[str]
+    allowed_origins: tuple[str, ...]
+    projects_root: Path
+    duckdb_threads: int | None = None
+    duckdb_memory_limit: str | None = None
 
 
+@lru_cache(maxsize=1)
 def load_settings() -> Settings:
+    # Parsed once per process; main and the routers share the same snapshot.
     default_data_dir = (Path(__file__).resolve().parents[2] / ".data-weaver").resolve()
     raw_data_dir = os.getenv("DATA_WEAVER_DATA_DIR", "")
     data_dir = Path(raw_data_dir).expanduser().resolve() if raw_data_dir else default_data_dir
     raw_origins = os.getenv("DATA_WEAVER_ALLOWED_ORIGINS", "http://localhost:8080,http://127.0.0.1:8080")
-    allowed_origins = [o.strip() for o in raw_origins.split(",") if o.strip()]
-    return Settings(data_dir=data_dir, allowed_origins=allowed_origins)
+    allowed_origins = tuple(o.strip() for o in raw_origins.split(",") if o.strip())
+    raw_threads = os.getenv("DATA_WEAVER_DUCKDB_THREADS", "").strip()
+    duckdb_threads = int(raw_threads) if raw_threads else None
+    duckdb_memory_limit = os.getenv("DATA_WEAVER_DUCKDB_MEMORY_LIMIT", "").strip() or None
+    return Settings(
+        data_dir=data_dir,
+        allowed_origins=allowed_origins,
+        projects_root=data_dir / "projects",
+        duckdb_threads=duckdb_threads,
+        duckdb_memory_limit=duckdb_memory_limit,
+    )
@@ -1,20 +1,22 @@
 from __future__ import annotations
 
-import json
+import os
 from dataclasses import asdict
 from pathlib import Path
 from typing import Any
 
+import orjson
+
 from .settings import Settings
 from .utils import ensure_dir, utcnow
 
 
 def projects_root(settings: Settings) -> Path:
-    return settings.data_dir / "projects"
+    return settings.projects_root
 
 
 def project_dir(settings: Settings, project_id: str) -> Path:
-    return projects_root(settings) / project_id
+    return settings.projects_root / project_id
 
 
 def project_db_path(settings: Settings, project_id: str) -> Path:
@@ -33,30 +35,73 @@ def project_manifest_path(settings: Settings, project_id: str) -> Path:
     return project_dir(settings, project_id) / "project.json"
 
 
+def create_project_dirs(settings: Settings, project_id: str) -> None:
+    # One makedirs for the project dir (which also holds the warehouse), then a plain mkdir
+    # per leaf instead of a stat + mkdir round trip for each.
+    os.makedirs(project_dir(settings, project_id), exist_ok=True)
+    for leaf in (project_files_dir(settings, project_id), project_exports_dir(settings, project_id)):
+        try:
+            os.mkdir(leaf)
+        except FileExistsError:
+            pass
+
+
 def write_project_manifest(settings: Settings, project_id: str, payload: dict[str, Any]) -> None:
-    ensure_dir(project_dir(settings, project_id))
     path = project_manifest_path(settings, project_id)
     payload = {**payload, "updatedAt": utcnow().isoformat()}
-    path.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    data = orjson.dumps(payload, option=orjson.OPT_INDENT_2)
+    try:
+        path.write_bytes(data)
+    except FileNotFoundError:
+        ensure_dir(path.parent)
+        path.write_bytes(data)
 
 
 def read_project_manifest(settings: Settings, project_id: str) -> dict[str, Any] | None:
     path = project_manifest_path(settings, project_id)
-    if not path.exists():
+    try:
+        return orjson.loads(path.read_bytes())
+    except FileNotFoundError:
         return None
-    return json.loads(path.read_text(encoding="utf-8"))
+
+
+# manifest path -> (its mtime_ns, parsed manifest). Listing stats every manifest but only
+# re-reads the ones written since the last call; entries for removed projects are dropped.
+_manifest_cache: dict[str, tuple[int, dict[str, Any]]] = {}
 
 
 def list_project_manifests(settings: Settings) -> list[dict[str, Any]]:
-    root = projects_root(settings)
-    if not root.exists():
-        return []
     manifests: list[dict[str, Any]] = []
-    for p in root.iterdir():
-        if not p.is_dir():
-            continue
-        manifest = read_project_manifest(settings, p.name)
-        if manifest:
-            manifests.append(manifest)
+    seen: set[str] = set()
+    # scandir's DirEntry answers is_dir() from the directory listing itself, so the only
+    # per-project syscall is the manifest stat.
+    try:
+        entries = os.scandir(projects_root(settings))
+    except FileNotFoundError:
+        return []
+    with entries:
+        for entry in entries:
+            if not entry.is_dir():
+                continue
+            path = Path(entry.path) / "project.json"
+            key = str(path)
+            try:
+                mtime = os.stat(key).st_mtime_ns
+            except FileNotFoundError:
+                continue
+            seen.add(key)
+            cached = _manifest_cache.get(key)
+            if cached is not None and cached[0] == mtime:
+                manifest = cached[1]
+            else:
+                try:
+                    manifest = orjson.loads(path.read_bytes())
+                except FileNotFoundError:
+                    continue
+                _manifest_cache[key] = (mtime, manifest)
+            if manifest:
+                manifests.append(manifest)
+    for key in _manifest_cache.keys() - seen:
+        _manifest_cache.pop(key, None)
     manifests.sort(key=lambda m: m.get("updatedAt", ""), reverse=True)
     return manifests
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
+import os
 import re
+import string
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
 from typing import Iterable
-from uuid import uuid4
+from uuid import UUID, uuid4
 
 
 _IDENT_RE = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
@@ -14,6 +17,12 @@ def new_id(prefix: str) -> str:
     return f"{prefix}-{uuid4().hex}"
 
 
+def new_ids(prefix: str, n: int) -> list[str]:
+    # Same format as new_id, drawing the randomness for all n ids from one urandom call.
+    raw = os.urandom(16 * n)
+    return [f"{prefix}-{UUID(bytes=raw[i:i + 16], version=4).hex}" for i in range(0, 16 * n, 16)]
+
+
 def utcnow() -> datetime:
     return datetime.now(tz=timezone.utc)
 
@@ -22,12 +31,16 @@ def ensure_dir(path: Path) -> None:
     path.mkdir(parents=True, exist_ok=True)
 
 
+# Both are pure and see the same few column names over and over while SQL is assembled.
+# Invalid names raise, and lru_cache never stores a raised call.
+@lru_cache(maxsize=2048)
 def safe_ident(name: str) -> str:
     if not _IDENT_RE.match(name):
         raise ValueError(f"Invalid identifier: {name!r}")
     return name
 
 
+@lru_cache(maxsize=2048)
 def quote_ident(name: str) -> str:
     # Quote SQL identifiers safely for DuckDB.
     # DuckDB supports double-quoted identifiers with embedded quotes escaped by doubling.
@@ -37,16 +50,30 @@ def quote_ident(name: str) -> str:
     return f"\"{escaped}\""
 
 
+_STATA_INVALID_RE = re.compile(r"[^A-Za-z0-9_]")
+_STATA_LEADING = frozenset(string.ascii_letters + "_")
+_STATA_KEEP = _STATA_LEADING | frozenset(string.digits)
+# ASCII names (the common case) are cleaned by one str.translate pass; anything else falls
+# back to the regex, which also replaces non-ASCII characters.
+_STATA_ASCII_TRANS = str.maketrans({chr(c): "_" for c in range(128) if chr(c) not in _STATA_KEEP})
+
+
 def sanitize_stata_varname(name: str) -> str:
-    cleaned = re.sub(r"[^A-Za-z0-9_]", "_", name.strip())
+    stripped = name.strip()
+    if stripped.isascii():
+        cleaned = stripped.translate(_STATA_ASCII_TRANS)
+    else:
+        cleaned = _STATA_INVALID_RE.sub("_", stripped)
     if not cleaned:
         cleaned = "v"
-    if not re.match(r"^[A-Za-z_]", cleaned):
+    if cleaned[0] not in _STATA_LEADING:
         cleaned = f"v_{cleaned}"
     return cleaned[:32]
 
 
 def dedupe_names(names: Iterable[str]) -> list[str]:
+    # name -> last suffix handed out for it. Suffixes skipped over are taken for good, so the
+    # next collision resumes after the last one instead of rescanning from _1.
     seen: dict[str, int] = {}
     out: list[str] = []
     for raw in names:
@@ -55,12 +82,12 @@ def dedupe_names(names: Iterable[str]) -> list[str]:
             seen[base] = 0
             out.append(base)
             continue
-        seen[base] += 1
-        suffix = seen[base]
+        suffix = seen[base] + 1
         candidate = f"{base}_{suffix}"
         while candidate in seen:
             suffix += 1
             candidate = f"{base}_{suffix}"
+        seen[base] = suffix
         seen[candidate] = 0
         out.append(candidate)
     return out
@@ -0,0 +1,33 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import duckdb
+import pytest
+
+from backend.app import services
+from backend.app.db import _init_schema
+
+
+@pytest.fixture
+def conn(tmp_path: Path):
+  csv_path = tmp_path / "values.csv"
+  csv_path.write_text("name,x\na,1.0\nb,3.0\nc,\nd,5.0\n")
+  conn = duckdb.connect(":memory:")
+  _init_schema(conn)
+  services.import_csv(conn, "file-1", "table-1", "values", csv_path)
+  conn.execute(f"insert into \"{services._active_physical_name(conn, 'table-1')}\" values ('e', 'nan'::double)")
+  yield conn
+  conn.close()
+
+
+def test_histogram_skips_nan(conn):
+  chart = services.compute_chart(conn, "table-1", {"kind": "histogram", "field": "x", "bins": 2})
+  bins = chart["data"]["bins"]
+  assert bins[0]["x0"] == 1.0
+  assert sum(b["count"] for b in bins) == 3
+
+
+def test_histogram_rejects_text_field(conn):
+  with pytest.raises(ValueError, match="numeric field"):
+    services.compute_chart(conn, "table-1", {"kind": "histogram", "field": "name"})
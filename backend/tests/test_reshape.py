@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import duckdb
+import pytest
+
+from backend.app import services
+from backend.app.db import _init_schema
+
+
+@pytest.fixture
+def conn(tmp_path: Path):
+  csv_path = tmp_path / "wide.csv"
+  csv_path.write_text("id,name,qty,amount,flag,w\n1,a,3,1.5,true,2024-01-01\n2,b,4,,false,2024-02-01\n")
+  conn = duckdb.connect(":memory:")
+  _init_schema(conn)
+  services.import_csv(conn, "file-1", "table-1", "wide", csv_path)
+  yield conn
+  conn.close()
+
+
+def _reshape(conn, value_vars: list[str]):
+  meta, report, _ = services.reshape_table(
+    conn,
+    {"tableId": "table-1", "direction": "wide-to-long", "idVars": ["id"], "valueVars": value_vars},
+  )
+  physical = services._active_physical_name(conn, meta["id"])
+  return report, conn.execute(f'select * from "{physical}"').fetchall()
+
+
+def test_wide_to_long_mixed_types_melts_as_text(conn):
+  report, rows = _reshape(conn, ["name", "amount", "flag", "w"])
+  assert report["rowsAfter"] == 8
+  assert rows[:4] == [(1, "name", "a"), (2, "name", "b"), (1, "amount", "1.5"), (2, "amount", None)]
+  assert rows[4:] == [(1, "flag", "true"), (2, "flag", "false"), (1, "w", "2024-01-01"), (2, "w", "2024-02-01")]
+
+
+def test_wide_to_long_numeric_types_stay_numeric(conn):
+  _, rows = _reshape(conn, ["qty", "amount"])
+  assert rows == [(1, "qty", 3.0), (2, "qty", 4.0), (1, "amount", 1.5), (2, "amount", None)]
+
+
+def test_wide_to_long_empty_value_vars_is_empty(conn):
+  report, rows = _reshape(conn, [])
+  assert report["rowsAfter"] == 0
+  assert rows == []